@@ -5,20 +5,61 @@ MAX_AGE = 120
 
 
 class Animal:
+    __slots__ = ('alive', 'food_base', 'name', 'age_base', 'x', 'y', 'directionH', 'id', 'scheduler')
+    width = MAX_ANIMAL_WIDTH  # the size is the same for the whole species.
+    height = MAX_ANIMAL_HEIGHT
+    lines = {}  # every species draws itself looking left (0) and right (1).
+    sprites = {}  # the same drawings as blocks ready to be stamped on the board.
+
     def __init__(self, name, age, x, y, directionH):
         self.alive = True
-        self.width = MAX_ANIMAL_HEIGHT
-        self.height = MAX_ANIMAL_HEIGHT
+        self.scheduler = None  # the Lifecycle of the aquarium, the food and age count from its clocks.
         self.food = STARTING_FOOD
         self.name = name
         self.age = age
         self.x = x
         self.y = y
         self.directionH = directionH
+        self.id = None  # given by the aquarium.
 
     def __str__(self):
         pass
 
+    def __getstate__(self):
+        # a pickled or copied animal leaves its aquarium with the food and the age it has now.
+        slots = {slot: getattr(self, slot) for cls in type(self).__mro__ for slot in getattr(cls, '__slots__', ())
+                 if hasattr(self, slot)}
+        slots.update(food_base=self.food, age_base=self.age, scheduler=None)
+        return None, slots
+
+    @property
+    def food(self) -> int:
+        scheduler = self.scheduler
+        return self.food_base if scheduler is None else self.food_base - scheduler.hunger
+
+    @food.setter
+    def food(self, food: int):
+        scheduler = self.scheduler
+        if scheduler is None:
+            self.food_base = food
+        else:
+            self.food_base = food + scheduler.hunger
+            scheduler.schedule_food(self)
+
+    @property
+    def age(self) -> int:
+        scheduler = self.scheduler
+        return self.age_base if scheduler is None else self.age_base + scheduler.years
+
+    @age.setter
+    def age(self, age: int):
+        scheduler = self.scheduler
+        if scheduler is None:
+            self.age_base = age
+        else:
+            self.age_base = age - scheduler.years
+            scheduler.schedule_age(self)
+
     def get_food(self) -> int:
         return self.food
 
@@ -30,11 +71,11 @@ class Animal:
         if self.food == 0:
             self.starvation()
 
-    def inc_age(self):
+    def inc_age(self, max_age=MAX_AGE):
         if not self.get_alive():
             return None  # we won't feed a dead fish.
         self.age += 1
-        if self.age == 120:
+        if self.age == max_age:
             self.die()
 
     def right(self):
@@ -77,4 +118,7 @@ class Animal:
         self.food += amount
 
     def get_animal(self):
-        pass
+        return self.lines.get(0 if self.directionH == 0 else 1)
+
+    def get_sprite(self):
+        return self.sprites.get(0 if self.directionH == 0 else 1)
@@ -1,10 +1,24 @@
+import contextlib
+import sys
+
 import Animal
+import Board
 import Crab
+import CrabLane
+import Engine
+import Events
+import FastForward
 import Fish
+import Lifecycle
 import Moly
+import Renderer
 import Ocypode
 import Scalar
 import Shrimp
+import SlotMap
+import Snapshot
+import SpatialIndex
+import Stats
 import main
 
 MAX_ANIMAL_HEIGHT = 8
@@ -16,142 +30,345 @@ MAX_FISH_WIDTH = 8
 WATERLINE = 3
 FEED_AMOUNT = 10
 MAX_AGE = 120
+BUSY_TURNS = 256  # advance checks that often whether the crabs bump too much to be stepped alone.
+MARK_COST = 64  # a marked row of a rectangle costs the renderer about as much as comparing 64 cells.
+SPECIES = {'sc': Scalar.Scalar, 'mo': Moly.Moly, 'sh': Shrimp.Shrimp, 'oc': Ocypode.Ocypode}
+CODES = {species: code for code, species in SPECIES.items()}
+ROWS = {}  # id(sprite) -> its rows as bytes, the sprites are shared by the species.
+BODY = ord('*')  # the cells of a sprite that take up space, like check_if_free always looked for.
+
+
+def sprite_rows(sprite) -> tuple:
+    rows = ROWS.get(id(sprite))
+    if rows is None:
+        rows = ROWS[id(sprite)] = tuple(bytes(line) for line in sprite)
+    return rows
 
 
 class Aqua:
-    def __init__(self, aqua_width, aqua_height):
+    def __init__(self, aqua_width, aqua_height, sparse=False):
         self.turn = 0
         self.aqua_height = aqua_height
         self.aqua_width = aqua_width
-        self.board = [' '] * self.aqua_height
-        self.build_tank()
-        self.anim = []
+        self.sparse = sparse  # for huge, mostly empty tanks: the memory follows the animals, not the size.
+        if sparse:
+            self.board = Board.SparseBoard(self.aqua_width, self.aqua_height)
+        else:
+            self.board = Board.Board(self.aqua_width, self.aqua_height)
+        self.board_stale = False  # set when the animals moved since the board was drawn.
+        self.drawn = {}  # id -> (x, y, width, height, sprite) of the animals on the board, None if not known.
+        self.anim = SlotMap.SlotMap()  # the animals in the order they came in, by id.
+        self.crabs = CrabLane.CrabLane(self.aqua_width, self.aqua_height)  # the crabs by their x, for the collisions.
+        self.scheduler = Lifecycle.Lifecycle()  # the food and the age of the animals, and when they die.
+        self.spatial = None  # the animals by position, built the first time it is needed (see spatial_index).
+        self.next_id = 1
+        self.renderer = None  # follows the board for the incremental frames.
+        self.profiler = None  # times the phases of the turns, see enable_stats.
+        self.feed_amount = FEED_AMOUNT
+        self.max_age = MAX_AGE
+        self.deaths = {'starvation': 0, 'age': 0}
+        self.last_death = None  # the turn of the last death.
+        self.listeners = []  # called with (turn, events) at the end of every turn.
+        self.events = []  # the events of the turn so far, only kept when someone listens.
 
     def build_tank(self):
-        col, row = self.aqua_width, len(self.board)
-        tank = [[' '] * col for _ in range(row)]
-        tank[2][1:-1] = '~' * (col - 2)
-        tank[-1] = ('_' * (col - 2)).join(['\\', '/'])
-        for row in tank[:-1]:
-            row[0], row[-1] = '|', '|'
-        self.board = tank
+        self.board.build_tank()
+        self.drawn = {}
 
-    def print_board(self):
+    def refresh_board(self) -> Board.Board:
         """
-        prints the updated board on screen
+        Draws the board again if the animals moved since it was drawn, and returns it.
+        The turns only move the animals, the board is drawn when someone looks at it.
+        Only the cells of the animals that moved, came or went are marked as changed
         """
-        for row in self.get_board():
-            print(' '.join(item for item in row))
-
-    def get_board(self):
+        if self.board_stale:
+            board, dirty, before = self.board, self.board.dirty, self.drawn
+            board.dirty = None  # the empty tank is the same as before, it is not a change.
+            self.build_tank()
+            self.print_animals_on_board(self.anim)
+            board.dirty = dirty
+            if dirty is not None:
+                self.mark_moves(before)
+            self.board_stale = False
         return self.board
 
+    def mark_moves(self, before):
+        """
+        Marks the cells where the animals were drawn before and where they are drawn now, for the
+        animals that moved, turned, came or went. Without before, or when the rectangles would cost
+        more to go through than the whole board to compare, the whole board is marked
+        """
+        changed = []
+        if before is not None:
+            for animal_id, now in self.drawn.items():
+                old = before.pop(animal_id, None)
+                if old is None or old[:4] != now[:4] or old[4] is not now[4]:
+                    changed.append(now)
+                    if old is not None:
+                        changed.append(old)
+            changed.extend(before.values())  # the animals that died.
+        rows = sum(rect[3] for rect in changed)
+        if before is None or rows * MARK_COST > self.aqua_width * self.aqua_height:
+            self.board.mark(0, 0, self.aqua_width, self.aqua_height)
+            return None
+        for x, y, width, height, sprite in changed:
+            self.board.mark(x, y, width, height)
+
+    def print_board(self, x0=0, y0=0, width=None, height=None, incremental=False, follow=None):
+        """
+        prints the updated board on screen, or the window of width x height cells from (x0, y0),
+        see render_viewport. An incremental frame redraws only what changed since the last one
+        """
+        if follow is not None or (x0, y0, width, height) != (0, 0, None, None):
+            for row in self.render_viewport(x0, y0, width, height, follow):
+                print(' '.join(row))
+            return None
+
+        self.refresh_board()
+        if incremental:
+            if self.renderer is None or self.renderer.board is not self.board:
+                self.renderer = Renderer.Renderer(self.board)
+            return self.renderer.frame()
+
+        if self.renderer is not None:  # the screen scrolls, the next incremental frame starts over.
+            self.renderer.close()
+            self.renderer = None
+        for y in range(self.aqua_height):
+            print(' '.join(self.board.row_string(y)))
+
+    def get_board(self, x0=0, y0=0, width=None, height=None):
+        """
+        Returns a copy of the board as a list of rows of single characters,
+        or of the window of width x height cells from (x0, y0)
+        """
+        if (x0, y0, width, height) == (0, 0, None, None):
+            return self.refresh_board().to_lists()
+        return [list(row) for row in self.render_viewport(x0, y0, width, height)]
+
+    def render_viewport(self, x0=0, y0=0, width=None, height=None, follow=None) -> list:
+        """
+        Returns the rows of the window of width x height cells from (x0, y0), clipped to the tank,
+        drawn straight from the animals in it: the board is not used, the cost follows the size of
+        the window. With follow (the name of an animal) the window is centered on that animal
+        """
+        width = self.aqua_width - x0 if width is None else width
+        height = self.aqua_height - y0 if height is None else height
+        if follow is not None:
+            x0, y0 = self.center_on(follow, width, height)
+        x0, x1 = max(x0, 0), min(x0 + width, self.aqua_width)
+        y0, y1 = max(y0, 0), min(y0 + height, self.aqua_height)
+        if x1 <= x0:  # like Board.rows, the rows of the window are there but empty.
+            return [''] * max(y1 - y0, 0)
+
+        rows = [Board.tank_row(self.aqua_width, self.aqua_height, y, x0, x1) for y in range(y0, y1)]
+        # the animals drawn on the window, in id order like on the board (later animals on top).
+        for animal in self.spatial_index().query(x0 - MAX_ANIMAL_WIDTH + 1, x1, y0 - MAX_ANIMAL_HEIGHT + 1, y1):
+            x, y = self.spatial.where[animal.id]
+            for dy, line in enumerate(animal.get_sprite()):
+                if y0 <= y + dy < y1:
+                    line = bytes(line)
+                    start, end = max(x, x0), min(x + len(line), x1)
+                    rows[y + dy - y0][start - x0:end - x0] = line[start - x:end - x]
+        return [row.decode('latin-1') for row in rows]
+
+    def center_on(self, name: str, width: int, height: int) -> (int, int):
+        """
+        Returns the corner of the width x height window centered on the animal with that name
+        """
+        animal = self.find(name)
+        if animal is None:
+            raise ValueError(f"There is no animal named {name!r}")
+        x, y, an_width, an_height = self.get_rect(animal)
+        x0 = min(max(x + an_width // 2 - width // 2, 0), max(self.aqua_width - width, 0))
+        y0 = min(max(y + an_height // 2 - height // 2, 0), max(self.aqua_height - height, 0))
+        return x0, y0
+
     def get_all_animal(self):
         """
         Returns the array that contains all the animals
         """
         return self.anim
 
+    def find(self, name: str):
+        """
+        Returns the animal with that name (the first one added if there are more), None if there is none
+        """
+        return self.scheduler.named(name)
+
+    def of_species(self, animaltype: str) -> list:
+        """
+        Returns the animals of a type ('sc', 'mo', 'sh' or 'oc'), by id
+        """
+        found = list(self.scheduler.species.get(SPECIES.get(animaltype), {}).values())
+        found.sort(key=lambda animal: animal.id)
+        return found
+
+    def starving(self, threshold=3) -> list:
+        """
+        Returns the animals with less than threshold food, by id
+        """
+        return self.scheduler.starving_below(threshold)
+
+    def older_than(self, age: int) -> list:
+        """
+        Returns the animals older than age, by id
+        """
+        return self.scheduler.older_than(age)
+
     def is_collision(self, animal: Animal) -> bool:
         """
         Returns True if the next step of the crab is a collision
         """
         x, y = animal.get_position()
         a_dir = animal.get_directionH()
-        aq_height = self.aqua_height
-        board = self.get_board()
-        crabs = [crab for crab in self.get_all_animal() if isinstance(crab, Crab.Crab) is True]
-        for crab_2 in crabs:  # we want to look only at crabs.
-            if (a_dir == 1 and crab_2.x == x + 7) or \
-                    (a_dir == 0 and crab_2.x + 7 == x):  # we got a collision.
-                self.delete_animal_from_board(crab_2)
-                crab_2.set_directionH(1) if crab_2.get_directionH() == 0 else \
-                    crab_2.set_directionH(0) if crab_2.get_directionH() == 1 else None
-                self.print_animal_on_board(crab_2)
-
-                self.delete_animal_from_board(animal)  # we need to check if our next spot is empty.
-                try:
-                    if (board[aq_height - 3][x - 1] not in ['|', '*'] and
-                            board[aq_height - 4][x - 1] not in ['|', '*']):
-                        animal.set_x(x - 1)
-                    elif (board[aq_height - 3][x + 8] not in ['|', '*'] and
-                          board[aq_height - 4][x + 8] not in ['|', '*']):
-                        animal.set_x(x + 1)
-                except IndexError:
-                    pass
-                animal.set_directionH(0) if a_dir == 1 else \
-                    animal.set_directionH(1) if a_dir == 0 else None
-                self.print_animal_on_board(animal)
-                return True
+        lane = self.crabs
+        if a_dir == 1:
+            crabs = self.crabs.crabs_at(x + 7)  # only the crabs right next to us.
+        elif a_dir == 0:
+            crabs = self.crabs.crabs_at(x - 7)
+        else:
+            crabs = []
+        if not crabs:
+            return False
+        crab_2 = crabs[0] if len(crabs) == 1 else min(crabs, key=self.anim.index)  # the first in the aquarium.
 
-        return False
+        lane.erase(crab_2)  # we got a collision.
+        crab_2.set_directionH(1) if crab_2.get_directionH() == 0 else \
+            crab_2.set_directionH(0) if crab_2.get_directionH() == 1 else None
+        lane.draw(crab_2)
+
+        self.emit('collided', crab_2, animal.id)
+        lane.erase(animal)  # we need to check if our next spot is empty.
+        try:
+            if not lane.blocked(x - 1):
+                animal.set_x(x - 1)
+            elif not lane.blocked(x + 8):
+                animal.set_x(x + 1)
+        except IndexError:
+            pass
+        animal.set_directionH(0) if a_dir == 1 else \
+            animal.set_directionH(1) if a_dir == 0 else None
+        lane.draw(animal)
+        self.emit('collided', animal, crab_2.id)
+        return True
 
     def print_animal_on_board(self, animal: Animal):
-        k = animal.get_animal()
+        k = animal.get_sprite()
         x, y = animal.get_position()
         an_height, an_width = animal.get_size()
         aq_height, aq_width = self.aqua_height, self.aqua_width
-        board = self.get_board()
+        if (aq_width - x) < an_width + 1:  # checks if x is too close to right wall.
+            animal.set_x(aq_width - an_width - 1)
+        if self.board_stale:  # it will be drawn with the others.
+            return None
         if isinstance(animal, Fish.Fish):
-            if (aq_width - x) < an_width + 1:  # checks if x is too close to right wall.
-                animal.set_x(aq_width - an_width - 1)
-            board[y][x:x + an_width] = k[0]
-            board[y + 1][x:x + an_width] = k[1]
-            board[y + 2][x:x + an_width] = k[2]
-
-            if isinstance(animal, Scalar.Scalar):
-                board[y + 3][x:x + an_width] = k[3]
-                board[y + 4][x:x + an_width] = k[4]
-
+            self.board.stamp(x, y, k)
         elif isinstance(animal, Crab.Crab):
-            if (aq_width - x) < an_width + 1:  # checks if x is too close to right wall.
-                animal.set_x(aq_width - an_width - 1)
-            board[aq_height - 4][x:x + an_width] = k[len(k) - 3]
-            board[aq_height - 3][x:x + an_width] = k[len(k) - 2]
-            board[aq_height - 2][x:x + an_width] = k[len(k) - 1]
+            y = aq_height - 1 - an_height  # crabs stand on the floor.
+            self.board.stamp(x, y, k)
+        else:
+            return None
+        if self.drawn is not None:
+            self.drawn[animal.id] = (x, y, an_width, an_height, k)
 
-            if isinstance(animal, Ocypode.Ocypode):
-                board[aq_height - 5][x:x + an_width] = k[0]
+    def print_animals_on_board(self, animals):
+        """
+        Draws many animals in one pass, later animals on top
+        """
+        xs, tops, sprite_ids, sprites, known = [], [], [], [], {}
+        drawn = self.drawn if self.drawn is not None else {}
+        for animal in animals:
+            x, top, an_width, an_height = self.get_rect(animal)
+            sprite = animal.get_sprite()
+            drawn[animal.id] = (x, top, an_width, an_height, sprite)
+            if id(sprite) not in known:
+                known[id(sprite)] = len(sprites)
+                sprites.append(sprite)
+            xs.append(x)
+            tops.append(top)
+            sprite_ids.append(known[id(sprite)])
+        self.board.stamp_many(xs, tops, sprite_ids, sprites)
 
     def delete_animal_from_board(self, animal: Animal):
+        if self.drawn is not None:
+            self.drawn.pop(animal.id, None)
         x, y = animal.get_position()
         an_height, an_width = animal.get_size()
-        board = self.get_board()
-        aq_height = self.aqua_height
-        for h in range(an_height):
-            if isinstance(animal, Fish.Fish):
-                board[y + h][x:x + an_width] = ' ' * an_width
-            else:
-                board[aq_height - 2 - h][x:x + an_width] = ' ' * an_width
+        if isinstance(animal, Fish.Fish):
+            self.board.clear(x, y, an_width, an_height)
+        else:
+            self.board.clear(x, self.aqua_height - 1 - an_height, an_width, an_height)
 
     def add_animal(self, name, age, x, y, directionH, directionV, animaltype):
         if animaltype == 'sc' or animaltype == 'mo':
             return self.add_fish(name, age, x, y, directionH, directionV, animaltype)
         elif animaltype == 'oc' or animaltype == 'sh':
             return self.add_crab(name, age, x, y, directionH, animaltype)
+        return False
 
-    def add_fish(self, name, age, x, y, directionH, directionV, fishtype):
+    def add_animals(self, specs) -> list:
         """
-        Adding fish to the aquarium
+        Adding many animals at once, every spec is (name, age, x, y, directionH, directionV, animaltype).
+        Returns a list with True for every spec that was added, nothing is printed
+        """
+        rows = []
+        for name, age, x, y, directionH, directionV, animaltype in specs:
+            if animaltype in SPECIES:
+                x, y = self.place(x, y, animaltype)
+            rows.append((name, age, x, y, directionH, directionV, animaltype))
+
+        added, flags = [], []
+        for name, age, x, y, directionH, directionV, animaltype in rows:
+            # the animals added by the specs before are in the spatial index already.
+            ok = animaltype in SPECIES and self.check_if_free(x, y)
+            if ok:
+                animal = self.create(name, age, x, y, directionH, directionV, animaltype)
+                self.insert(animal)
+                added.append(animal)
+            flags.append(ok)
+
+        self.print_animals_on_board(added)
+        return flags
+
+    def place(self, x: int, y: int, animaltype: str) -> (int, int):
+        """
+        Returns the position a new animal of this type gets, moved away from the walls
         """
         aq_height, aq_width = self.aqua_height, self.aqua_width
-        if (aq_width - x) < MAX_FISH_WIDTH + 1:  # checks if x is too close to right wall.
-            x = aq_width - MAX_FISH_WIDTH - 1
-
-        if fishtype == 'sc':  # width - 8, height = 5
-            if (aq_height - MAX_ANIMAL_HEIGHT - 1) <= y:
-                y = aq_height - MAX_CRAB_HEIGHT - 6
-            new_fish = Scalar.Scalar(name, age, x, y, directionH, directionV)
-        elif fishtype == 'mo':  # width = 8, height = 3
-            if (aq_height - MAX_ANIMAL_HEIGHT) <= y:
+        if animaltype == 'sc' or animaltype == 'mo':
+            if (aq_width - x) < MAX_FISH_WIDTH + 1:  # checks if x is too close to right wall.
+                x = aq_width - MAX_FISH_WIDTH - 1
+            if animaltype == 'sc':  # width - 8, height = 5
+                if (aq_height - MAX_ANIMAL_HEIGHT - 1) <= y:
+                    y = aq_height - MAX_CRAB_HEIGHT - 6
+            elif (aq_height - MAX_ANIMAL_HEIGHT) <= y:  # moly: width = 8, height = 3
                 y = aq_height - MAX_CRAB_HEIGHT - 4
-            new_fish = Moly.Moly(name, age, x, y, directionH, directionV)
+        else:
+            if (aq_width - x) < MAX_CRAB_WIDTH + 1:  # checks if x is too close to right wall.
+                x = aq_width - MAX_CRAB_WIDTH - 1
+            y = aq_height - MAX_CRAB_HEIGHT
+        return x, y
+
+    def create(self, name, age, x, y, directionH, directionV, animaltype) -> Animal:
+        """
+        Returns a new animal of the given type, without putting it in the aquarium
+        """
+        if animaltype in ('sc', 'mo'):
+            return SPECIES[animaltype](name, age, x, y, directionH, directionV)
+        return SPECIES[animaltype](name, age, x, y, directionH)
+
+    def add_fish(self, name, age, x, y, directionH, directionV, fishtype):
+        """
+        Adding fish to the aquarium
+        """
+        x, y = self.place(x, y, fishtype)
+        new_fish = SPECIES[fishtype](name, age, x, y, directionH, directionV)
 
         if not self.check_if_free(x, y):  # check if we get an 8x8 cube of free space.
             print("The place is not available! Please try again later. ")
             return False
 
-        self.anim.append(new_fish)
+        self.insert(new_fish)
         self.print_animal_on_board(new_fish)
         return True
 
@@ -159,128 +376,544 @@ class Aqua:
         """
         Adding crab to the aquarium
         """
-        if (self.aqua_width - x) < MAX_CRAB_WIDTH + 1:  # checks if x is too close to right wall.
-            x = self.aqua_width - MAX_CRAB_WIDTH - 1
-        y = self.aqua_height - MAX_CRAB_HEIGHT
+        x, y = self.place(x, y, crabtype)
 
         if not self.check_if_free(x, y):
             print("The place is not available! Please try again later. ")
             return False
 
-        if crabtype == 'sh':  # shrimp
-            new_crab = Shrimp.Shrimp(name, age, x, y, directionH)
-        elif crabtype == 'oc':  # ocypode
-            new_crab = Ocypode.Ocypode(name, age, x, y, directionH)
-        self.anim.append(new_crab)
+        new_crab = SPECIES[crabtype](name, age, x, y, directionH)
+        self.insert(new_crab)
         self.print_animal_on_board(new_crab)
         return True
 
+    def insert(self, animal: Animal):
+        """
+        Gives the animal an id (unless it has one already) and puts it in the aquarium
+        """
+        if animal.id is None:
+            animal.id = self.next_id
+        self.next_id = max(self.next_id, animal.id + 1)
+        self.anim.append(animal)
+        self.scheduler.add(animal)
+        if self.spatial is not None:
+            self.track(animal)
+        if isinstance(animal, Crab.Crab):
+            self.crabs.add(animal)
+            self.crabs.draw(animal)
+        self.emit('added', animal, CODES[type(animal)])
+
+    def spatial_index(self) -> SpatialIndex.SpatialIndex:
+        """
+        Returns the index of the animals by position, it is built the first time and from then on
+        the turns keep it up to date
+        """
+        if self.spatial is None:
+            self.spatial = SpatialIndex.SpatialIndex()
+            for animal in self.anim:
+                self.track(animal)
+        return self.spatial
+
+    def track(self, animal: Animal):
+        """
+        Moves the animal in the spatial index to where it is drawn
+        """
+        x, y = animal.get_position()
+        if isinstance(animal, Crab.Crab):
+            y = self.aqua_height - 1 - animal.height
+        self.spatial.move(animal, x, y)
+
+    def get_rect(self, animal: Animal) -> (int, int, int, int):
+        """
+        Returns the cells the animal covers on the board as (x, y, width, height)
+        """
+        x, y = animal.get_position()
+        an_height, an_width = animal.get_size()
+        if isinstance(animal, Crab.Crab):
+            y = self.aqua_height - 1 - an_height  # crabs stand on the floor.
+        return x, y, an_width, an_height
+
     def check_if_free(self, x: int, y: int) -> bool:
         """
-        method for checking whether the position is empty before inserting a new animal
+        method for checking whether the position is empty before inserting a new animal.
+        No '*' of an animal may be in the 8x8 window, only the animals near it are looked at
         """
-        try:
-            for t in range(MAX_ANIMAL_HEIGHT):
-                for i in self.board[y + t][x:x + MAX_ANIMAL_WIDTH]:
-                    if i == '*':
-                        return False  # we have an animal there
-        except IndexError:  # happens every time for the crabs.
-            pass
+        # the window is clipped to the tank, for the crabs it ends at the floor.
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + MAX_ANIMAL_WIDTH, self.aqua_width), min(y + MAX_ANIMAL_HEIGHT, self.aqua_height)
+        if x1 <= x0 or y1 <= y0:
+            return True
+        near = self.spatial_index().query(x0 - MAX_ANIMAL_WIDTH + 1, x1, y0 - MAX_ANIMAL_HEIGHT + 1, y1)
+        covered = set()  # the cells of the window under an animal drawn above the next ones.
+        for animal in reversed(near):  # like on the board, a later animal covers the earlier ones.
+            ax, ay = self.spatial.where[animal.id]
+            rows = sprite_rows(animal.get_sprite())
+            cx0, cx1 = max(ax, x0), min(ax + len(rows[0]), x1)
+            for row in range(max(ay, y0), min(ay + len(rows), y1)):
+                line = rows[row - ay]
+                for column in range(cx0, cx1):
+                    if line[column - ax] == BODY and (column, row) not in covered:
+                        return False
+                covered.update((column, row) for column in range(cx0, cx1))
         return True
 
     def left(self, a: Animal):
         animal = a
         x, y = animal.get_position()
-        if self.board[y][x - 1] == '|':  # first we check if we hit a wall on the next move.
-            self.delete_animal_from_board(animal)
+        crab = isinstance(animal, Crab.Crab)
+        if x - 1 in (0, -1):  # first we check if we hit a wall on the next move (-1 is the right wall).
+            if crab:
+                self.crabs.erase(animal)
             animal.set_directionH(1)
-            return self.print_animal_on_board(animal)
+            if crab:
+                self.crabs.draw(animal)
+            return None
 
-        if isinstance(animal, Crab.Crab):
+        if crab:
             if self.is_collision(animal):  # this function will handle crabs collisions.
                 return None
-
-        self.delete_animal_from_board(animal)
-        animal.left()
-        self.print_animal_on_board(animal)
+            self.crabs.erase(animal)
+            animal.left()
+            self.crabs.draw(animal)
+        else:
+            animal.left()
 
     def right(self, a: Animal):
         animal = a
         x, y = animal.get_position()
-        if (isinstance(animal, Crab.Crab) and self.board[y][x + 7] == '|') or \
-                (isinstance(animal, Fish.Fish) and self.board[y][x + 8] == '|'):
-            self.delete_animal_from_board(animal)  # if it's a wall just turn around
+        crab = isinstance(animal, Crab.Crab)
+        if x + animal.width == self.aqua_width - 1:
+            if crab:
+                self.crabs.erase(animal)  # if it's a wall just turn around
             animal.set_directionH(0)
-            return self.print_animal_on_board(animal)
+            if crab:
+                self.crabs.draw(animal)
+            return None
 
-        if isinstance(animal, Crab.Crab):
+        if crab:
             if self.is_collision(animal):  # this will handle crabs collisions.
                 return None
-
-        self.delete_animal_from_board(animal)
-        animal.right()
-        self.print_animal_on_board(animal)
+            self.crabs.erase(animal)
+            animal.right()
+            self.crabs.draw(animal)
+        else:
+            animal.right()
 
     def up(self, a: Animal):
         fish = a
         x, y = fish.get_position()
         if y == WATERLINE:
-            self.delete_animal_from_board(fish)
             fish.set_directionV(0)
-            return self.print_animal_on_board(fish)
-
-        self.delete_animal_from_board(fish)
+            return None
         fish.up()
-        self.print_animal_on_board(fish)
 
     def down(self, a: Animal):
         fish = a
         x, y = fish.get_position()
         if self.aqua_height - y - fish.height - 1 == MAX_CRAB_HEIGHT:  # lower edge
             fish.set_directionV(1)
-            self.delete_animal_from_board(fish)
-            self.print_animal_on_board(fish)
             return None
-
-        self.delete_animal_from_board(fish)
         fish.down()
-        self.print_animal_on_board(fish)
 
     def next_turn(self):
         """
         Managing a single step
         """
-        for animal in self.anim[:]:
-            if self.turn % 10 == 0:
-                animal.dec_food()
-                if self.turn % 100 == 0:
-                    animal.inc_age()
-
-                if not animal.get_alive():  # check if the fish has died.
-                    self.delete_animal_from_board(animal)
-                    self.anim.remove(animal)
-                    continue
-
-            try:
-                if animal.get_directionV() == 0:
-                    self.down(animal)
-                else:
-                    self.up(animal)
-            except AttributeError:
-                pass
-
-            if animal.get_directionH() == 1:
-                self.right(animal)
-                if animal.get_directionH() == 0:  # skip if the animal has changed direction.
-                    continue
+        listening = bool(self.listeners)
+        spatial = self.spatial
+        dying = self.lifecycle()
+        aging = listening and self.turn % 100 == 0
+        for animal in self.anim:
+            if aging and dying.get(animal.id) != 'starvation':
+                self.emit('aged', animal)
+            if dying and animal.id in dying:
+                self.die(animal, dying[animal.id])
+                continue
+
+            if listening:
+                before = (animal.x, animal.y, animal.directionH, getattr(animal, 'directionV', 0))
+                self.move(animal)
+                self.emit_move(animal, before)
+            else:
+                self.move(animal)
+            if spatial is not None:
+                self.track(animal)
+
+        for animal_id in dying:  # the next pass over the animals closes the holes, in one go.
+            self.anim.discard(animal_id)
+        self.redraw()
+        if listening:
+            self.flush_events()
+        self.turn += 1
+
+    def move(self, animal: Animal):
+        """
+        Moves the animal one step up or down (fish only) and one step left or right
+        """
+        try:
+            if animal.get_directionV() == 0:
+                self.down(animal)
             else:
-                self.left(animal)
+                self.up(animal)
+        except AttributeError:
+            pass
 
-        for anim in self.anim:  # make sure the animals are not missing body parts.
-            self.delete_animal_from_board(anim)
-            self.print_animal_on_board(anim)
+        if animal.get_directionH() == 1:
+            self.right(animal)
+        else:
+            self.left(animal)
 
-        self.turn += 1
+    def lifecycle(self) -> dict:
+        """
+        Every 10th turn the animals feed on their food, every 100th turn they also get older.
+        Returns the cause of every death of the turn by id, found by the scheduler without
+        going through the animals
+        """
+        if self.turn % 10 != 0:
+            return {}
+        return self.scheduler.tick(self.turn % 100 == 0, self.max_age)
+
+    def die(self, animal: Animal, cause: str):
+        """
+        The animal dies of starvation or of old age, it is taken off the crab lane.
+        next_turn takes it out of the aquarium at the end of the turn
+        """
+        if cause == 'starvation':
+            animal.starvation()
+        else:
+            animal.die()
+        self.deaths[cause] += 1
+        self.emit('died', animal, cause)
+        self.last_death = self.turn
+        if self.spatial is not None:
+            self.spatial.remove(animal)
+        if isinstance(animal, Crab.Crab):
+            self.crabs.erase(animal)
+            self.crabs.remove(animal)
+
+    def redraw(self) -> int:
+        """
+        Draws the crab lane again and returns how many animals will be drawn on the board.
+        The board itself is drawn when someone looks at it, see refresh_board
+        """
+        # make sure the crabs are not missing body parts.
+        self.crabs.redraw(anim for anim in self.anim if isinstance(anim, Crab.Crab))
+        self.board_stale = True
+        return len(self.anim)
+
+    def emit(self, kind, animal: Animal, detail=None):
+        """
+        Records an event of the current turn, if someone listens
+        """
+        if self.listeners:
+            self.events.append(Events.make(self.turn, kind, animal, detail))
+
+    def emit_move(self, animal: Animal, before):
+        """
+        Records how the animal moved in its step, a collision already has its own event
+        """
+        events = self.events
+        if events and events[-1].kind == 'collided' and events[-1].id == animal.id:
+            return None
+        x, y, directionH, directionV = before
+        if (animal.x, animal.y) != (x, y):
+            self.emit('moved', animal)
+        if (animal.directionH, getattr(animal, 'directionV', 0)) != (directionH, directionV):
+            self.emit('bounced', animal)
+
+    def flush_events(self):
+        """
+        Hands the events recorded so far to the listeners, as a single batch
+        """
+        events, self.events = self.events, []
+        for listener in self.listeners:
+            listener(self.turn, events)
+
+    def subscribe(self, listener):
+        """
+        Calls listener(turn, events) at the end of every turn with the events of the turn
+        (see Events.Event), the animals added or fed between two turns come with the next one.
+        The per animal path is used while someone listens
+        """
+        self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+        if not self.listeners:
+            self.events = []
+
+    def stream(self, steps, feed_every=0):
+        """
+        Runs steps turns and yields (turn, events) after every one of them
+        """
+        batches = []
+        listener = self.subscribe(lambda turn, events: batches.append((turn, events)))
+        try:
+            for i in range(steps):
+                if feed_every and i % feed_every == 0:
+                    self.feed_all()
+                self.next_turn()
+                yield from batches
+                batches.clear()
+        finally:
+            self.unsubscribe(listener)
+
+    def batch_turns(self, turns=1, feed_every=0):
+        """
+        Managing several steps at once with the vectorized engine
+        """
+        self.run(turns, feed_every=feed_every, quiet=False)
+
+    def run(self, steps, render_every=0, feed_every=0, snapshot_every=0, quiet=True,
+            checkpoint_every=0, checkpoint_path=None) -> list:
+        """
+        Runs the simulation at full speed without printing anything (the death messages included).
+        The board is printed every render_every turns, the animals are fed every feed_every turns
+        and a snapshot is taken every snapshot_every turns. Returns the snapshots.
+        Every checkpoint_every turns the aquarium is saved to checkpoint_path, see save
+        """
+        if checkpoint_every and checkpoint_path is None:
+            raise ValueError("checkpoint_every needs a checkpoint_path")
+        # without numpy, or when someone listens to the events, the animals move one by one.
+        engine = Engine.Engine(self) if Engine.np is not None and not self.listeners else None
+        if engine is not None and self.profiler is not None:
+            self.profiler.instrument(engine, Stats.ENGINE_PHASES)
+        snapshots = []
+        done = 0
+        while done < steps:
+            chunk = steps - done
+            for every in (render_every, snapshot_every, checkpoint_every):
+                if every:
+                    chunk = min(chunk, every - done % every)
+
+            with contextlib.redirect_stdout(None if quiet else sys.stdout):
+                for i in range(done, done + chunk):
+                    if feed_every and i % feed_every == 0:
+                        engine.feed_all(self.feed_amount) if engine is not None else self.feed_all()
+                    engine.next_turn() if engine is not None else self.next_turn()
+            done += chunk
+
+            render = render_every and done % render_every == 0
+            snapshot = snapshot_every and done % snapshot_every == 0
+            checkpoint = checkpoint_every and done % checkpoint_every == 0
+            if engine is not None and (render or snapshot or checkpoint or done == steps):
+                engine.store()
+            if render:
+                self.print_board()
+            if snapshot:
+                snapshots.append(self.snapshot())
+            if checkpoint:
+                self.save(checkpoint_path, board=False)  # the board may not be drawn yet.
+        if engine is not None and self.profiler is not None:
+            self.profiler.uninstrument(engine)
+        return snapshots
+
+    def advance(self, turns: int):
+        """
+        Runs turns turns like next_turn, but jumps over the turns where the animals only swim
+        between the walls: their positions are computed in closed form. Only the turns where an
+        animal dies are run in full, the crabs alone are stepped through the turns where they bump
+        into each other, and once the crabs are back where they were the same bumps are jumped over too.
+        When the crabs bump all the time, everyone is stepped with run for a while instead
+        """
+        end = self.turn + turns
+        if self.listeners or self.profiler is not None or not self.can_fast_forward():
+            while self.turn < end:  # every turn is needed, or an animal is off the round trip.
+                self.next_turn()
+            return None
+        while self.turn < end:
+            stop = self.next_death(end)
+            if stop == self.turn:
+                self.next_turn()
+            elif self.swim(stop) < stop:  # the crabs bump all the time, everyone is stepped for a while.
+                self.run(min(end - self.turn, BUSY_TURNS), quiet=False)
+
+    def swim_bounds(self, animal: Animal) -> (int, int, int, int):
+        """
+        Returns the columns and the rows the animal goes back and forth between, the rows are None for a crab
+        """
+        x_hi = self.aqua_width - 1 - animal.width  # where right turns around.
+        if isinstance(animal, Crab.Crab):
+            return 1, x_hi, None, None
+        return 1, x_hi, WATERLINE, self.aqua_height - 1 - MAX_CRAB_HEIGHT - animal.height
+
+    def can_fast_forward(self) -> bool:
+        """
+        Returns True if every animal is on its round trip between the walls
+        """
+        for animal in self.anim:
+            x_lo, x_hi, y_lo, y_hi = self.swim_bounds(animal)
+            if animal.directionH not in (0, 1) or not x_lo <= animal.x <= x_hi:
+                return False
+            if y_lo is not None and (animal.directionV not in (0, 1) or not y_lo <= animal.y <= y_hi):
+                return False
+        return True
+
+    def next_death(self, end: int) -> int:
+        """
+        Returns the first turn before end where an animal dies, end if none
+        """
+        stop = end
+        ticks, years = self.scheduler.next_deaths(self.max_age)
+        if ticks is not None:
+            stop = min(stop, FastForward.tick_turn(self.turn, 10, ticks))
+        if years is not None:
+            stop = min(stop, FastForward.tick_turn(self.turn, 100, years))
+        return stop
+
+    def swim(self, stop: int) -> int:
+        """
+        Runs the turns up to stop, where nobody dies. The animals are put where they are at stop in
+        closed form, the crabs are only stepped (without the fish) through the turns they bump on.
+        When the crabs bump so much that about as many of them are stepped as next_turn would step,
+        it stops early. Returns the turn it stopped at
+        """
+        start = self.turn
+        crabs = [animal for animal in self.anim if isinstance(animal, Crab.Crab)]
+        lo, hi = 1, self.aqua_width - 1 - MAX_CRAB_WIDTH
+        meetings = FastForward.Meetings(lo, hi, start, [(crab.x, crab.directionH == 1) for crab in crabs])
+        seen = {}  # where the crabs were -> the turn, the crabs move the same way from the same place.
+        busy, since = 0, start  # how many crabs were stepped since the turn since.
+        while True:
+            turn = meetings.next(min(stop, meetings.deadline))
+            if turn is None:
+                if meetings.deadline >= stop:
+                    break
+                turn = meetings.deadline
+                if turn - since >= BUSY_TURNS:
+                    if 2 * busy >= (turn - since) * len(crabs):
+                        stop = turn
+                        break
+                    busy, since = 0, turn
+                now = meetings.look(turn)
+                if now in seen:
+                    cycle = turn - seen.pop(now)
+                    laps = (stop - turn) // cycle
+                    if laps:
+                        meetings = FastForward.Meetings(lo, hi, turn + laps * cycle, now)
+                        seen = {}
+                        busy, since = 0, turn + laps * cycle
+                        continue
+                seen[now] = turn
+                continue
+            near = meetings.around(turn, {i for pair in meetings.due for i in pair})
+            busy += len(near)
+            for i in near:
+                crabs[i].x, forward = meetings.where(i, turn)
+                crabs[i].directionH = 1 if forward else 0
+            self.crabs.rebuild(crabs[i] for i in near)  # the others are too far to be felt.
+            for i in near:
+                crab = crabs[i]
+                self.right(crab) if crab.directionH == 1 else self.left(crab)
+            meetings.stepped(turn, {i: (crabs[i].x, crabs[i].directionH == 1) for i in near})
+
+        turns = stop - start
+        for i, crab in enumerate(crabs):
+            crab.x, forward = meetings.where(i, stop)
+            crab.directionH = 1 if forward else 0
+        for animal in self.anim:
+            x_lo, x_hi, y_lo, y_hi = self.swim_bounds(animal)
+            if y_lo is None:
+                continue
+            phase = FastForward.phase(animal.x, animal.directionH == 1, x_lo, x_hi)
+            animal.x, right = FastForward.position(phase + turns, x_lo, x_hi)
+            animal.directionH = 1 if right else 0
+            phase = FastForward.phase(animal.y, animal.directionV == 0, y_lo, y_hi)
+            animal.y, down = FastForward.position(phase + turns, y_lo, y_hi)
+            animal.directionV = 0 if down else 1
+        self.scheduler.skip(FastForward.ticks(start, turns, 10), FastForward.ticks(start, turns, 100))
+        self.crabs.rebuild(crabs)
+        if self.spatial is not None:
+            for animal in self.anim:
+                self.track(animal)
+        self.turn = stop
+        self.board_stale = True
+        return stop
+
+    def enable_stats(self, capacity=1000, summary_every=0, stream=None):
+        """
+        Starts timing the phases of every turn (lifecycle, movement, collision, redraw) and counting
+        the collisions, deaths and redraws. The turns of run with numpy do not redraw, their redraws
+        are None. The last capacity turns are kept, a summary line is written to stream (stderr by
+        default) every summary_every turns
+        """
+        self.disable_stats()
+        self.profiler = Stats.Stats(capacity, summary_every, stream)
+        self.profiler.instrument(self, Stats.AQUA_PHASES)
+
+    def disable_stats(self):
+        """
+        Stops the timing, the turns run at full speed again
+        """
+        if self.profiler is not None:
+            self.profiler.uninstrument()
+            self.profiler = None
+
+    def stats(self, last=None):
+        """
+        Returns the summary of the last turns recorded (all of them by default), None if the stats are off
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.summary(last)
+
+    def snapshot(self) -> tuple:
+        """
+        Returns the turn and the state of every animal: (id, name, type, age, x, y, directionH, directionV, food)
+        """
+        animals = [(animal.id, animal.name, CODES[type(animal)], animal.age, animal.x, animal.y,
+                    animal.directionH, getattr(animal, 'directionV', 0), animal.food) for animal in self.anim]
+        return self.turn, animals
+
+    def summary(self) -> dict:
+        """
+        Returns a short summary of the tank: the survivors by type, the deaths by cause and the turn of the last death
+        """
+        species = {}
+        for animal in self.anim:
+            code = CODES[type(animal)]
+            species[code] = species.get(code, 0) + 1
+        return {'turn': self.turn, 'survivors': len(self.anim), 'species': species,
+                'deaths': dict(self.deaths), 'last_death': self.last_death}
+
+    def __getstate__(self):
+        """
+        Pickles the animals as plain rows, the board and the indexes are built again when unpickling
+        """
+        state = {key: value for key, value in vars(self).items()
+                 if key not in ('anim', 'board', 'crabs', 'scheduler', 'spatial', 'renderer', 'profiler',
+                                'listeners', 'events', 'drawn')
+                 and not callable(value)}
+        state['animals'] = [(animal.id, animal.name, CODES[type(animal)], animal.age, animal.x, animal.y,
+                             animal.directionH, getattr(animal, 'directionV', 0), animal.food, animal.alive)
+                            for animal in self.anim]
+        return state
+
+    def __setstate__(self, state):
+        animals = state.pop('animals')
+        self.__init__(state['aqua_width'], state['aqua_height'], state.get('sparse', False))
+        self.__dict__.update(state)
+        for animal_id, name, code, age, x, y, directionH, directionV, food, alive in animals:
+            animal = self.create(name, age, x, y, directionH, directionV, code)
+            animal.id, animal.food, animal.alive = animal_id, food, alive
+            self.anim.append(animal)
+        self.scheduler.rebuild(self.anim)
+        self.crabs.rebuild(animal for animal in self.anim if isinstance(animal, Crab.Crab))
+        self.board_stale = True
+
+    def save(self, path, board=True):
+        """
+        Saves the aquarium in a binary snapshot file, the board is left out when board is False
+        """
+        Snapshot.save(self, path, board)
+
+    @staticmethod
+    def load(path):
+        """
+        Returns the aquarium saved in a snapshot file
+        """
+        return Snapshot.load(path)
 
     def print_all(self):
         """
@@ -293,8 +926,22 @@ class Aqua:
         """
         feed all the animals in the aquarium
         """
-        for animal in self.get_all_animal():
-            animal.add_food(FEED_AMOUNT)
+        self.scheduler.feed(self.feed_amount)  # every animal at once, see Lifecycle.
+        if self.listeners:
+            for animal in self.get_all_animal():
+                self.emit('fed', animal, self.feed_amount)
+
+    def feed_region(self, x0: int, x1: int, y0: int, y1: int, amount=None) -> int:
+        """
+        Feeds only the animals drawn from the columns x0 to x1 and the rows y0 to y1 (the ends excluded,
+        an animal is where the top left corner of its drawing is). Returns how many were fed
+        """
+        amount = self.feed_amount if amount is None else amount
+        fed = self.spatial_index().query(x0, x1, y0, y1)
+        for animal in fed:
+            animal.add_food(amount)
+            self.emit('fed', animal, amount)
+        return len(fed)
 
     def several_steps(self):
         """
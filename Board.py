@@ -0,0 +1,247 @@
+try:
+    import numpy as np
+except ImportError:  # without numpy the board is kept as bytearray rows.
+    np = None
+
+WATERLINE_ROW = 2
+EMPTY = ord(' ')
+TILE = 32  # the sparse board keeps TILE x TILE tiles, only where something was drawn.
+
+
+def make_block(lines):
+    """
+    Converts the lines of a sprite into a block that can be stamped on a board
+    """
+    if np is not None:
+        block = np.array([list(line.encode('latin-1')) for line in lines], dtype=np.uint8)
+        block.flags.writeable = False
+        return block
+    return tuple(line.encode('latin-1') for line in lines)
+
+
+def tank_row(width: int, height: int, y: int, x0: int, x1: int) -> bytearray:
+    """
+    Returns the cells x0 to x1 of the row y of an empty width x height tank
+    """
+    if y == height - 1:
+        fill, left, right = b'_', b'\\', b'/'
+    else:
+        fill, left, right = b'~' if y == WATERLINE_ROW else b' ', b'|', b'|'
+    cells = bytearray(fill * (x1 - x0))
+    if x0 == 0 and x1 > 0:
+        cells[0:1] = left
+    if x0 < width <= x1 and width > 0:
+        cells[width - 1 - x0:width - x0] = right
+    return cells
+
+
+class Board:
+    def __init__(self, width, height, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        self.width = width
+        self.height = height
+        self.use_numpy = use_numpy
+        self.cells = None
+        self.dirty = None  # the rectangles changed since the last frame, a renderer turns this on.
+        self.build_tank()
+
+    def build_tank(self):
+        """
+        Draws the empty tank: the walls, the waterline and the floor
+        """
+        col, row = self.width, self.height
+        floor = b'\\' + b'_' * (col - 2) + b'/'
+        if self.use_numpy:
+            cells = np.full((row, col), EMPTY, dtype=np.uint8)
+            cells[WATERLINE_ROW, 1:-1] = ord('~')
+            cells[:-1, 0] = ord('|')
+            cells[:-1, -1] = ord('|')
+            cells[-1] = np.frombuffer(floor, dtype=np.uint8)
+        else:
+            cells = [bytearray(b' ' * col) for _ in range(row)]
+            cells[WATERLINE_ROW][1:-1] = b'~' * (col - 2)
+            for line in cells[:-1]:
+                line[0], line[-1] = ord('|'), ord('|')
+            cells[-1] = bytearray(floor)
+        self.cells = cells
+        self.mark(0, 0, col, row)
+
+    def mark(self, x: int, y: int, width: int, height: int):
+        """
+        Remembers that a rectangle changed, if a renderer is following the board
+        """
+        if self.dirty is not None:
+            self.dirty.append((x, y, width, height))
+
+    def stamp(self, x: int, y: int, block):
+        """
+        Writes a whole sprite block with its top left corner at (x, y)
+        """
+        if self.use_numpy:
+            height, width = block.shape
+            self.cells[y:y + height, x:x + width] = block
+            if self.dirty is not None:
+                self.dirty.append((x, y, width, height))
+            return None
+        if self.dirty is not None:
+            self.dirty.append((x, y, len(block[0]), len(block)))
+        for line, row in zip(block, self.cells[y:y + len(block)]):
+            if not isinstance(line, bytes):
+                line = bytes(line)
+            row[x:x + len(line)] = line
+
+    def clear(self, x: int, y: int, width: int, height: int):
+        """
+        Erases a width x height rectangle with its top left corner at (x, y)
+        """
+        if self.dirty is not None:
+            self.dirty.append((x, y, width, height))
+        if self.use_numpy:
+            self.cells[y:y + height, x:x + width] = EMPTY
+            return None
+        for row in self.cells[y:y + height]:
+            row[x:x + width] = b' ' * len(row[x:x + width])
+
+    def stamp_many(self, xs, ys, sprite_ids, sprites):
+        """
+        Stamps sprites[sprite_ids[i]] at (xs[i], ys[i]) in order, later sprites on top
+        """
+        for x, y, sprite_id in zip(xs, ys, sprite_ids):
+            self.stamp(x, y, sprites[sprite_id])
+
+    def row_string(self, y: int) -> str:
+        if self.use_numpy:
+            return self.cells[y].tobytes().decode('latin-1')
+        return self.cells[y].decode('latin-1')
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns all the cells, row after row
+        """
+        if self.use_numpy:
+            return self.cells.tobytes()
+        return b''.join(self.cells)
+
+    def fill(self, data):
+        """
+        Replaces all the cells with the bytes of data, row after row (as returned by to_bytes)
+        """
+        width, height = self.width, self.height
+        if self.use_numpy:
+            self.cells = np.frombuffer(data, dtype=np.uint8, count=width * height).reshape(height, width).copy()
+        else:
+            self.cells = [bytearray(data[y * width:(y + 1) * width]) for y in range(height)]
+        self.mark(0, 0, width, height)
+
+    def to_lists(self):
+        """
+        Returns a copy of the board as a list of rows of single characters
+        """
+        return [list(self.row_string(y)) for y in range(self.height)]
+
+
+class SparseBoard:
+    """
+    A board for huge, mostly empty tanks: the walls, the waterline and the floor are worked out
+    when they are read, only the tiles something was drawn on are kept. It has the same methods
+    as Board, the memory follows the animals instead of the size of the tank
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.use_numpy = False
+        self.tiles = {}  # (column, row) of a tile -> its rows, as bytearrays of TILE cells.
+        self.dirty = None
+        self.build_tank()
+
+    def build_tank(self):
+        self.tiles = {}
+        self.mark(0, 0, self.width, self.height)
+
+    def mark(self, x: int, y: int, width: int, height: int):
+        if self.dirty is not None:
+            self.dirty.append((x, y, width, height))
+
+    def background(self, y: int, x0: int, x1: int) -> bytearray:
+        return tank_row(self.width, self.height, y, x0, x1)
+
+    def tile(self, column: int, row: int) -> list:
+        """
+        Returns the rows of a tile, it starts as the empty tank the first time something is drawn on it
+        """
+        tile = self.tiles.get((column, row))
+        if tile is None:
+            x0 = column * TILE
+            tile = [bytearray(TILE) for _ in range(TILE)]
+            for dy, cells in enumerate(tile):
+                y = row * TILE + dy
+                if y < self.height:
+                    line = self.background(y, x0, min(x0 + TILE, self.width))
+                    cells[:len(line)] = line
+            self.tiles[column, row] = tile
+        return tile
+
+    def put(self, x: int, y: int, data):
+        """
+        Writes the bytes of data on the row y from the column x, clipped to the board
+        """
+        if not 0 <= y < self.height:
+            return None
+        x0, x1 = max(x, 0), min(x + len(data), self.width)
+        while x0 < x1:
+            column = x0 // TILE
+            end = min(x1, (column + 1) * TILE)
+            self.tile(column, y // TILE)[y % TILE][x0 % TILE:x0 % TILE + end - x0] = data[x0 - x:end - x]
+            x0 = end
+
+    def stamp(self, x: int, y: int, block):
+        self.mark(x, y, len(block[0]), len(block))
+        for dy, line in enumerate(block):
+            self.put(x, y + dy, bytes(line))
+
+    def clear(self, x: int, y: int, width: int, height: int):
+        self.mark(x, y, width, height)
+        for row in range(max(y, 0), min(y + height, self.height)):
+            x0, x1 = max(x, 0), min(x + width, self.width)
+            if x0 < x1:
+                self.put(x0, row, b' ' * (x1 - x0))
+
+    def stamp_many(self, xs, ys, sprite_ids, sprites):
+        for x, y, sprite_id in zip(xs, ys, sprite_ids):
+            self.stamp(x, y, sprites[sprite_id])
+
+    def row_bytes(self, y: int, x0: int, x1: int) -> bytearray:
+        """
+        Returns the cells x0 to x1 of the row y, from the tiles where there are some
+        """
+        cells = self.background(y, x0, x1)
+        row, dy = divmod(y, TILE)
+        for column in range(x0 // TILE, (x1 - 1) // TILE + 1 if x1 > x0 else 0):
+            tile = self.tiles.get((column, row))
+            if tile is None:
+                continue
+            start, end = max(x0, column * TILE), min(x1, (column + 1) * TILE)
+            cells[start - x0:end - x0] = tile[dy][start % TILE:start % TILE + end - start]
+        return cells
+
+    def row_string(self, y: int) -> str:
+        return self.row_bytes(y, 0, self.width).decode('latin-1')
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns all the cells, row after row (as big as a dense board)
+        """
+        return b''.join(self.row_bytes(y, 0, self.width) for y in range(self.height))
+
+    def fill(self, data):
+        self.build_tank()
+        width = self.width
+        for y in range(self.height):
+            line = data[y * width:(y + 1) * width]
+            if line != self.background(y, 0, width):
+                self.put(0, y, line)
+
+    def to_lists(self):
+        return [list(self.row_string(y)) for y in range(self.height)]
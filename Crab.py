@@ -5,6 +5,8 @@ MAX_CRAB_WIDTH = 7
 
 
 class Crab(Animal.Animal):
+    __slots__ = ()
+
     def __init__(self, name, age, x, y, directionH):
         super().__init__(name, age, x, y, directionH)
 
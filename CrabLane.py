@@ -0,0 +1,109 @@
+LANE_ROWS = (4, 3)  # the lane is the board rows height - 4 and height - 3, where the crabs collide.
+LANES = {}  # (class, directionH) -> the lane lines, encoded once like the sprites.
+
+
+def lane_lines(crab) -> tuple:
+    """
+    Returns the two sprite lines of the crab that are on the lane, as bytes
+    """
+    key = (type(crab), 0 if crab.directionH == 0 else 1)
+    lines = LANES.get(key)
+    if lines is None:
+        sprite = crab.get_animal()  # the last line of a crab is on the row height - 2.
+        lines = LANES[key] = tuple(sprite[crab.height + 1 - row].encode('latin-1') for row in LANE_ROWS)
+    return lines
+
+
+class CrabLane:
+    """
+    Index of the crabs on the floor lane, bucketed by their x position.
+    It also keeps the two rows of the board the collisions look at, drawn the same way the
+    board was, so the crabs can move without the board being drawn
+    """
+
+    def __init__(self, width=0, height=0):
+        self.width = width
+        self.height = height
+        self.at = {}  # x -> the crabs standing there, in the order they were indexed.
+        self.where = {}  # crab -> the x it is indexed under.
+        self.rows = None
+        self.clear_rows()
+
+    def __len__(self):
+        return len(self.where)
+
+    def add(self, crab):
+        x = crab.get_position()[0]
+        self.where[crab] = x
+        self.at.setdefault(x, []).append(crab)
+
+    def remove(self, crab):
+        x = self.where.pop(crab, None)
+        if x is None:
+            return None
+        bucket = self.at[x]
+        bucket.remove(crab)
+        if not bucket:
+            del self.at[x]
+
+    def update(self, crab):
+        """
+        Moves the crab to the bucket of its current x, if it is indexed
+        """
+        old_x = self.where.get(crab)
+        if old_x is None or old_x == crab.get_position()[0]:
+            return None
+        self.remove(crab)
+        self.add(crab)
+
+    def rebuild(self, crabs):
+        """
+        Indexes the crabs again and draws them on the lane, later crabs on top
+        """
+        self.at, self.where = {}, {}
+        crabs = list(crabs)
+        for crab in crabs:
+            self.add(crab)
+        self.redraw(crabs)
+
+    def crabs_at(self, x: int) -> list:
+        return self.at.get(x, [])
+
+    def clear_rows(self):
+        """
+        Empties the lane, only the walls are left
+        """
+        width = self.width
+        self.rows = [bytearray(b'|' + b' ' * (width - 2) + b'|') if width > 1 else bytearray(width)
+                     for _ in LANE_ROWS]
+
+    def redraw(self, crabs):
+        self.clear_rows()
+        for crab in crabs:
+            self.draw(crab)
+
+    def erase(self, crab):
+        """
+        Clears the columns of the crab on the lane
+        """
+        x, width = crab.x, crab.width
+        for row in self.rows:
+            row[x:x + width] = b' ' * len(row[x:x + width])
+
+    def draw(self, crab):
+        """
+        Draws the crab on the lane where it stands now and indexes it there
+        """
+        x = crab.x
+        for row, line in zip(self.rows, lane_lines(crab)):
+            if x + len(line) <= len(row):
+                row[x:x + len(line)] = line
+            else:  # clipped by the end of the lane.
+                row[x:] = line[:max(len(row) - x, 0)]
+        self.update(crab)
+
+    def blocked(self, x: int) -> bool:
+        """
+        Returns True if the column x of the lane has a wall or a crab in it
+        """
+        return any(row[x] in b'|*' for row in self.rows)
@@ -0,0 +1,239 @@
+try:
+    import numpy as np
+except ImportError:  # the engine needs numpy, Aqua.batch_turns falls back to next_turn.
+    np = None
+
+import Aqua
+import Fish
+
+
+class Engine:
+    """
+    Advances all the animals of an aquarium together, kept as arrays (struct of arrays).
+    Fish are moved with numpy operations, crabs one by one since every crab collision
+    depends on the crabs that moved before it in the same turn.
+    """
+
+    def __init__(self, aqua):
+        self.aqua = aqua
+        self.turn = aqua.turn
+        self.objects = list(aqua.get_all_animal())
+        self.classes = []
+        self.lane_lines = []  # for every class the two sprite lines on the lane, looking left and right.
+        kind = [self.class_index(animal) for animal in self.objects]
+
+        objects = self.objects
+        self.kind = np.array(kind, dtype=np.int64)
+        self.fish = np.array([isinstance(animal, Fish.Fish) for animal in objects], dtype=bool)
+        self.x = np.array([animal.x for animal in objects], dtype=np.int64)
+        self.y = np.array([animal.y for animal in objects], dtype=np.int64)
+        self.directionH = np.array([animal.directionH for animal in objects], dtype=np.int64)
+        self.directionV = np.array([getattr(animal, 'directionV', 0) for animal in objects], dtype=np.int64)
+        self.food = np.array([animal.food for animal in objects], dtype=np.int64)
+        self.age = np.array([animal.age for animal in objects], dtype=np.int64)
+        self.height = np.array([animal.height for animal in objects], dtype=np.int64)
+        self.width = np.array([animal.width for animal in objects], dtype=np.int64)
+
+    def class_index(self, animal) -> int:
+        """
+        Returns the index of the animal's class, taking its lane lines the first time it is seen
+        """
+        cls = type(animal)
+        if cls not in self.classes:
+            self.classes.append(cls)
+            self.lane_lines.append([[line.encode('latin-1') for line in cls.lines[d][-3:-1]] for d in (0, 1)])
+        return self.classes.index(cls)
+
+    def feed_all(self, amount):
+        self.food += amount
+
+    def next_turn(self):
+        """
+        Managing a single step for every animal at once
+        """
+        if not self.objects:  # an empty tank only counts the turns.
+            self.turn += 1
+            return None
+        dying = np.zeros(len(self.objects), dtype=bool)
+        if self.turn % 10 == 0:
+            dying = self.lifecycle()
+        self.move_fish(self.fish & ~dying)
+        self.move_crabs(dying)
+
+        if dying.any():
+            self.remove(~dying)
+        self.turn += 1
+
+    def lifecycle(self):
+        """
+        Decrements the food, ages the animals on every 100th turn and returns the dying ones
+        """
+        self.food -= 1
+        starving = self.food == 0
+        old = np.zeros_like(starving)
+        if self.turn % 100 == 0:
+            aging = ~starving
+            self.age[aging] += 1
+            old = aging & (self.age == self.aqua.max_age)
+
+        dying = starving | old
+        if dying.any():
+            deaths = self.aqua.deaths
+            deaths['starvation'] += int(starving.sum())
+            deaths['age'] += int(old.sum())
+            self.aqua.last_death = self.turn
+        for i in np.flatnonzero(dying):  # the animals report their own death, in the aquarium order.
+            animal = self.objects[i]
+            animal.food, animal.age = int(self.food[i]), int(self.age[i])
+            if starving[i]:
+                animal.starvation()
+            else:
+                animal.die()
+        return dying
+
+    def move_fish(self, fish):
+        aq_height, aq_width = self.aqua.aqua_height, self.aqua.aqua_width
+        x, y, directionH, directionV = self.x, self.y, self.directionH.copy(), self.directionV.copy()
+
+        down = fish & (directionV == 0)
+        floor = down & (aq_height - y - self.height - 1 == Aqua.MAX_CRAB_HEIGHT)
+        self.directionV[floor] = 1
+        y[down & ~floor] += 1
+        up = fish & (directionV != 0)
+        waterline = up & (y == Aqua.WATERLINE)
+        self.directionV[waterline] = 0
+        y[up & ~waterline] -= 1
+
+        right = fish & (directionH == 1)
+        wall = right & (x + 8 == aq_width - 1)
+        self.directionH[wall] = 0
+        x[right & ~wall] += 1
+        left = fish & (directionH != 1)
+        wall = left & ((x == 1) | (x == 0))  # the wall is at x - 1 (or x - 1 == -1).
+        self.directionH[wall] = 1
+        x[left & ~wall] -= 1
+
+    def move_crabs(self, dying):
+        """
+        Moves the crabs in the aquarium order, replaying the collisions of Aqua.is_collision
+        """
+        crabs = np.flatnonzero(~self.fish)
+        if not len(crabs):
+            return None
+        self.crab_x = self.x.tolist()
+        self.crab_dir = self.directionH.tolist()
+        self.lane = self.build_lane(crabs)
+        self.at = {}  # x -> the crabs standing there.
+        for i in crabs.tolist():
+            self.at.setdefault(self.crab_x[i], []).append(i)
+
+        aq_width = self.aqua.aqua_width
+        x, direction = self.crab_x, self.crab_dir
+        for i in crabs.tolist():
+            if dying[i]:
+                self.erase(i)
+                self.at[x[i]].remove(i)
+                continue
+
+            if direction[i] == 1:
+                if x[i] + 7 == aq_width - 1:  # if it's a wall just turn around
+                    self.turn_crab(i, 0)
+                elif not self.is_collision(i):
+                    self.move_crab(i, x[i] + 1)
+            else:
+                if x[i] in (0, 1):
+                    self.turn_crab(i, 1)
+                elif not self.is_collision(i):
+                    self.move_crab(i, x[i] - 1)
+
+        self.x[crabs] = np.array(x)[crabs]
+        self.directionH[crabs] = np.array(direction)[crabs]
+
+    def is_collision(self, i) -> bool:
+        x, a_dir = self.crab_x[i], self.crab_dir[i]
+        if a_dir == 1:
+            others = self.at.get(x + 7)
+        elif a_dir == 0:
+            others = self.at.get(x - 7)
+        else:
+            others = None
+        if not others:
+            return False
+
+        other = min(others)  # the first crab in the aquarium order.
+        self.erase(other)
+        self.crab_dir[other] = flip(self.crab_dir[other])
+        self.draw(other)
+
+        self.erase(i)
+        top, bottom = self.lane
+        if chr(top[x - 1]) not in '|*' and chr(bottom[x - 1]) not in '|*':
+            self.set_crab_x(i, x - 1)
+        elif x + 8 < len(top) and chr(top[x + 8]) not in '|*' and chr(bottom[x + 8]) not in '|*':
+            self.set_crab_x(i, x + 1)
+        self.crab_dir[i] = flip(a_dir)
+        self.draw(i)
+        return True
+
+    def turn_crab(self, i, direction):
+        self.erase(i)
+        self.crab_dir[i] = direction
+        self.draw(i)
+
+    def move_crab(self, i, x):
+        self.erase(i)
+        self.set_crab_x(i, x)
+        self.draw(i)
+
+    def set_crab_x(self, i, x):
+        self.at[self.crab_x[i]].remove(i)
+        self.at.setdefault(x, []).append(i)
+        self.crab_x[i] = x
+
+    def build_lane(self, crabs):
+        width = self.aqua.aqua_width
+        self.lane = (bytearray(b'|' + b' ' * (width - 2) + b'|'), bytearray(b'|' + b' ' * (width - 2) + b'|'))
+        for i in crabs.tolist():
+            self.draw(i)
+        return self.lane
+
+    def erase(self, i):
+        x, width = self.crab_x[i], int(self.width[i])
+        for row in self.lane:
+            row[x:x + width] = b' ' * len(row[x:x + width])
+
+    def draw(self, i):
+        x = self.crab_x[i]
+        lines = self.lane_lines[self.kind[i]][0 if self.crab_dir[i] == 0 else 1]
+        for row, line in zip(self.lane, lines):
+            row[x:x + len(line)] = line[:len(row[x:x + len(line)])]
+
+    def remove(self, keep):
+        self.objects = [animal for animal, kept in zip(self.objects, keep) if kept]
+        for name in ('kind', 'fish', 'x', 'y', 'directionH', 'directionV', 'food', 'age', 'height', 'width'):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def store(self):
+        """
+        Writes the arrays back into the animals of the aquarium, the board is drawn when it is looked at
+        """
+        state = zip(self.objects, self.x.tolist(), self.y.tolist(), self.directionH.tolist(),
+                    self.directionV.tolist(), self.food.tolist(), self.age.tolist(), self.fish.tolist())
+        for animal, x, y, directionH, directionV, food, age, fish in state:
+            animal.x, animal.y, animal.directionH = x, y, directionH
+            animal.food, animal.age = food, age
+            if fish:
+                animal.directionV = directionV
+        aqua = self.aqua
+        aqua.anim[:] = self.objects
+        aqua.scheduler.rebuild(aqua.anim)
+        aqua.spatial = None  # indexed again by the next feed_region.
+        aqua.crabs.rebuild(animal for animal, fish in zip(self.objects, self.fish.tolist()) if not fish)
+        aqua.turn = self.turn
+        aqua.board_stale = True
+
+
+def flip(direction):
+    if direction == 0:
+        return 1
+    return 0 if direction == 1 else direction
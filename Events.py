@@ -0,0 +1,43 @@
+import collections
+import json
+
+KINDS = ('added', 'moved', 'bounced', 'collided', 'fed', 'aged', 'died')
+# detail: the type of the animal for 'added' ('sc', 'mo', 'sh' or 'oc'), the other crab for 'collided',
+# the amount for 'fed' and the cause ('starvation' or 'age') for 'died'.
+Event = collections.namedtuple('Event', 'turn kind id name x y directionH directionV food age detail')
+
+
+def make(turn, kind, animal, detail=None) -> Event:
+    """
+    Returns an event about the animal as it is now
+    """
+    return Event(turn, kind, animal.id, animal.name, animal.x, animal.y, animal.directionH,
+                 getattr(animal, 'directionV', 0), animal.food, animal.age, detail)
+
+
+class EventLog:
+    """
+    A listener that writes every turn as a single JSON line: {"turn": ..., "events": [[kind, id, ...], ...]}
+    """
+
+    def __init__(self, file, skip_empty=True):
+        self.file = file
+        self.skip_empty = skip_empty  # no line for the turns where nothing happened.
+
+    def __call__(self, turn, events):
+        if not events and self.skip_empty:
+            return None
+        rows = [event[1:] for event in events]
+        self.file.write(json.dumps({'turn': turn, 'events': rows}, separators=(',', ':')) + '\n')
+
+
+def read(file):
+    """
+    Yields (turn, events) for every line of an event log
+    """
+    for line in file:
+        if not line.strip():
+            continue
+        batch = json.loads(line)
+        turn = batch['turn']
+        yield turn, [Event(turn, *row) for row in batch['events']]
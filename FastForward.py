@@ -0,0 +1,233 @@
+# the closed form of the moves between two walls. On its own an animal goes from lo to hi one step
+# a turn, spends a turn turning around, comes back to lo and turns around again: its phase in that
+# round trip grows by one every turn, modulo the period 2 * (hi - lo) + 2.
+
+import heapq
+
+REACH = 7  # a crab bumps into a crab 7 columns ahead of it, where that one stands when it looks.
+FEEL = 2 * REACH  # in a turn a crab never feels a crab more than 9 columns away, with room to spare.
+
+
+def period(lo: int, hi: int) -> int:
+    return 2 * (hi - lo) + 2
+
+
+def ticks(turn: int, turns: int, every: int) -> int:
+    """
+    Returns how many of the turns from turn on (turns of them) are multiples of every
+    """
+    return (turn + turns - 1) // every - (turn - 1) // every
+
+
+def tick_turn(turn: int, every: int, count: int) -> int:
+    """
+    Returns the turn of the count-th multiple of every from turn on (turn itself is the first if it is one)
+    """
+    return -(-turn // every) * every + every * (count - 1)
+
+
+def phase(x: int, forward: bool, lo: int, hi: int) -> int:
+    """
+    Returns the phase of an animal at x going forward (to hi) or back (to lo)
+    """
+    return x - lo if forward else 2 * hi - lo + 1 - x
+
+
+def position(phase: int, lo: int, hi: int) -> (int, bool):
+    """
+    Returns the position and the way (True for forward) of an animal at a phase
+    """
+    span = hi - lo
+    phase %= 2 * span + 2
+    if phase <= span:
+        return lo + phase, True
+    return lo + 2 * span + 1 - phase, False
+
+
+def stretch(phase: int, span: int) -> (int, int, bool, bool):
+    """
+    Returns how many turns the animal keeps the same move from this phase on, the move (+1, -1 or 0),
+    its way and whether it can step into another animal (it does not when it turns around)
+    """
+    if phase < span:
+        return span - phase, 1, True, True
+    if phase == span:
+        return 1, 0, True, False
+    if phase < 2 * span + 1:
+        return 2 * span + 1 - phase, -1, False, True
+    return 1, 0, False, False
+
+
+def first_meeting(a: int, b: int, lo: int, hi: int, limit: int):
+    """
+    Returns the first turn (from 0) before limit when the crabs at the phases a and b bump into each
+    other, None if they never do. The crab at a moves first in a turn: it looks for the other one
+    where it stands, the other one looks for it where it went
+    """
+    span = hi - lo
+    every = period(lo, hi)
+    t = 0
+    limit = min(limit, every)  # the two phases are back where they were after a period.
+    while t < limit:
+        pa, pb = (a + t) % every, (b + t) % every
+        run_a, move_a, forward_a, steps_a = stretch(pa, span)
+        run_b, move_b, forward_b, steps_b = stretch(pb, span)
+        run = min(run_a, run_b, limit - t)
+        d = position(pb, lo, hi)[0] - position(pa, lo, hi)[0]
+        targets = []
+        if steps_a:  # a looks for b REACH columns ahead of it.
+            targets.append(REACH if forward_a else -REACH)
+        if steps_b:
+            targets.append(move_a - (REACH if forward_b else -REACH))
+        slope = move_b - move_a
+        best = None
+        for target in targets:
+            if slope == 0:
+                k = 0 if d == target else None
+            elif (target - d) % slope == 0 and (target - d) // slope >= 0:
+                k = (target - d) // slope
+            else:
+                k = None
+            if k is not None and k < run and (best is None or k < best):
+                best = k
+        if best is not None:
+            return t + best
+        t += run
+    return None
+
+
+class Meetings:
+    """
+    The turns when the crabs bump into each other, worked out pair by pair from their phases and
+    kept in a heap. Only the pairs of crabs close to each other are scheduled: every now and then
+    (look) the crabs are sorted by column, and the next look comes before two crabs that were far
+    apart can get close. A crab that bumped goes on from a new phase, only its pairs with the crabs
+    close to it are worked out again, the old ones are dropped by version
+    """
+
+    def __init__(self, lo: int, hi: int, turn: int, crabs: list):
+        """
+        crabs are the (x, forward) of the crabs at the turn, in the order they move
+        """
+        self.lo, self.hi = lo, hi
+        self.every = period(lo, hi)
+        self.offsets = [(phase(x, forward, lo, hi) - turn) % self.every for x, forward in crabs]
+        self.versions = [0] * len(crabs)  # bumped up every time a crab gets a new phase.
+        self.heap = []  # (turn, worked out, i, j, version of i, version of j)
+        self.paired = {}  # (i, j) -> the versions the pair was last scheduled with.
+        self.near = []  # for every crab, the crabs close to it at the last look.
+        self.reach = FEEL + (hi - lo) // max(len(crabs), 1)  # close, about one crab apart on average.
+        self.deadline = turn  # the turn of the next look.
+        self.due = []  # the pairs that bump on the turn next returned.
+        self.look(turn)
+
+    def where(self, i: int, turn: int) -> (int, bool):
+        """
+        Returns the position and the way of the crab i at the turn
+        """
+        return position(self.offsets[i] + turn, self.lo, self.hi)
+
+    def look(self, turn: int) -> tuple:
+        """
+        Finds the crabs close to each other at the turn, schedules their pairs that are not scheduled
+        yet and sets the next look. Returns where all the crabs are
+        """
+        now = tuple(self.where(i, turn) for i in range(len(self.offsets)))
+        order = sorted(range(len(now)), key=lambda i: now[i][0])
+        near = [[] for _ in now]
+        far = None  # the smallest gap between two crabs that are not close.
+        for k, i in enumerate(order):
+            x = now[i][0]
+            for m in range(k + 1, len(order)):
+                j = order[m]
+                gap = now[j][0] - x
+                if gap > self.reach:
+                    far = gap if far is None else min(far, gap)
+                    break
+                near[i].append(j)
+                near[j].append(i)
+                i_, j_ = min(i, j), max(i, j)
+                if self.paired.get((i_, j_)) != (self.versions[i_], self.versions[j_]):
+                    self.pair(i_, j_, turn, gap)
+        self.near = near
+        # until then two crabs that are not close stay more than FEEL apart, 2 columns a turn at most.
+        self.deadline = turn + (self.every if far is None else max(1, (far - FEEL + 1) // 2))
+        return now
+
+    def pair(self, i: int, j: int, turn: int, gap: int):
+        """
+        Schedules the crabs i and j (i moves first), gap columns apart, from the turn on
+        """
+        versions = (self.versions[i], self.versions[j])
+        self.paired[i, j] = versions
+        soon = max(0, (gap - REACH) // 2)  # they get 2 columns closer a turn at most.
+        heapq.heappush(self.heap, (turn + soon, False, i, j) + versions)
+
+    def work_out(self, i: int, j: int, turn: int):
+        """
+        Schedules the crabs i and j on the first turn from the turn on when they bump, if they ever do
+        """
+        a, b = (self.offsets[i] + turn) % self.every, (self.offsets[j] + turn) % self.every
+        meeting = first_meeting(a, b, self.lo, self.hi, self.every)
+        if meeting is not None:
+            heapq.heappush(self.heap, (turn + meeting, True, i, j, self.versions[i], self.versions[j]))
+
+    def next(self, stop: int):
+        """
+        Returns the first turn before stop when two crabs bump into each other, None if there is
+        none. The pairs that bump on that turn are left in due
+        """
+        heap, versions = self.heap, self.versions
+        self.due = []
+        while heap and heap[0][0] < stop:
+            turn, worked_out, i, j, version_i, version_j = heapq.heappop(heap)
+            if versions[i] != version_i or versions[j] != version_j:
+                continue
+            if not worked_out:
+                self.work_out(i, j, turn)
+                continue
+            self.due.append((i, j))
+            while heap and heap[0][0] == turn:  # the other pairs that bump on the same turn.
+                _, worked_out, i, j, version_i, version_j = heapq.heappop(heap)
+                if versions[i] != version_i or versions[j] != version_j:
+                    continue
+                if worked_out:
+                    self.due.append((i, j))
+                else:
+                    self.work_out(i, j, turn)
+            return turn
+        return None
+
+    def around(self, turn: int, crabs) -> list:
+        """
+        Returns the given crabs, the crabs within FEEL columns of them at the turn, the crabs within
+        FEEL columns of those and so on, in order
+        """
+        around = set(crabs)
+        todo = list(around)
+        while todo:
+            i = todo.pop()
+            x = self.where(i, turn)[0]
+            for j in self.near[i]:
+                if j not in around and abs(self.where(j, turn)[0] - x) <= FEEL:
+                    around.add(j)
+                    todo.append(j)
+        return sorted(around)
+
+    def stepped(self, turn: int, crabs: dict):
+        """
+        Takes the (x, forward) by index of the crabs that were stepped through the turn, the others
+        swam on their own: the crabs that bumped go on from there and get their pairs with the crabs
+        close to them worked out again, like the pairs that were due
+        """
+        after = turn + 1
+        bumped = set()
+        for i, (x, forward) in crabs.items():
+            if self.where(i, after) != (x, forward):
+                self.offsets[i] = (phase(x, forward, self.lo, self.hi) - after) % self.every
+                self.versions[i] += 1
+                bumped.add(i)
+        pairs = {(i, j) for i, j in self.due if i not in bumped and j not in bumped}
+        pairs.update((min(i, j), max(i, j)) for i in bumped for j in self.near[i])
+        for i, j in pairs:
+            self.pair(i, j, after, abs(self.where(j, after)[0] - self.where(i, after)[0]))
@@ -5,11 +5,12 @@ MAX_FISH_WIDTH = 8
 
 
 class Fish(Animal.Animal):
+    __slots__ = ('directionV',)
+    width = MAX_FISH_WIDTH
+    height = MAX_FISH_HEIGHT
 
     def __init__(self, name, age, x, y, directionH, directionV):
         super().__init__(name, age, x, y, directionH)
-        self.width = MAX_FISH_WIDTH
-        self.height = MAX_FISH_HEIGHT
         self.directionV = directionV
 
     def __str__(self):
@@ -0,0 +1,267 @@
+import bisect
+import heapq
+
+import Animal
+
+
+class Buckets:
+    """
+    The animals bucketed by a number, with the numbers in use kept sorted: the animals under or
+    over a number are found without looking at the others
+    """
+
+    def __init__(self):
+        self.at = {}  # number -> the animals with that number by id.
+        self.keys = []  # the numbers in use, sorted. Much fewer than the animals.
+        self.where = {}  # id -> the number the animal is at.
+
+    def __len__(self):
+        return len(self.where)
+
+    def move(self, animal: Animal, key: int):
+        """
+        Puts the animal at the number key, it can be new
+        """
+        old = self.where.get(animal.id)
+        if old is not None:
+            if old == key:
+                return None
+            self.discard(animal.id, old)
+        self.where[animal.id] = key
+        bucket = self.at.get(key)
+        if bucket is None:
+            bucket = self.at[key] = {}
+            bisect.insort(self.keys, key)
+        bucket[animal.id] = animal
+
+    def remove(self, animal: Animal):
+        old = self.where.pop(animal.id, None)
+        if old is not None:
+            self.discard(animal.id, old)
+
+    def discard(self, animal_id: int, key: int):
+        bucket = self.at[key]
+        del bucket[animal_id]
+        if not bucket:
+            del self.at[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def below(self, key: int) -> list:
+        """
+        Returns the animals at the numbers under key, by id
+        """
+        return self.collect(self.keys[:bisect.bisect_left(self.keys, key)])
+
+    def above(self, key: int) -> list:
+        """
+        Returns the animals at the numbers over key, by id
+        """
+        return self.collect(self.keys[bisect.bisect_right(self.keys, key):])
+
+    def collect(self, keys) -> list:
+        found = [animal for key in keys for animal in self.at[key].values()]
+        found.sort(key=lambda animal: animal.id)
+        return found
+
+
+class Lifecycle:
+    """
+    Keeps the food and the age of the animals of a tank as offsets from two clocks: the hunger
+    (the meals eaten by everybody minus the food given to everybody) and the years. A turn never
+    goes through the animals to feed or age them, and the animals that will starve or die of old
+    age are found in two heaps. As it follows every animal in and out of the tank, it also keeps
+    them by name, by species, by food and by age for the queries of the aquarium
+    """
+
+    def __init__(self):
+        self.hunger = 0
+        self.years = 0
+        self.max_age = None  # the max age the old age heap was kept for.
+        self.animals = {}  # id -> the animals following the clocks.
+        self.starving = []  # heap of (food base, id), an animal starves when the hunger reaches its food base.
+        self.old = []  # heap of (- age base, id), the oldest first.
+        self.hungry = {}  # id -> food base of the animals under 0 food, only a meal can bring them back.
+        self.names = {}  # name -> the animals with that name by id.
+        self.species = {}  # class -> the animals of that species by id.
+        self.by_food = Buckets()  # by food base, the clocks move every animal at once and the buckets stay.
+        self.by_age = Buckets()  # by age base.
+
+    def __len__(self):
+        return len(self.animals)
+
+    def add(self, animal: Animal):
+        """
+        The animal starts following the clocks with the food and the age it has now
+        """
+        if animal.scheduler is not None:
+            animal.scheduler.remove(animal)
+        food, age = animal.food, animal.age
+        animal.scheduler = self
+        self.animals[animal.id] = animal
+        self.names.setdefault(animal.name, {})[animal.id] = animal
+        self.species.setdefault(type(animal), {})[animal.id] = animal
+        animal.food, animal.age = food, age  # through schedule_food and schedule_age.
+
+    def remove(self, animal: Animal):
+        """
+        The animal leaves the clocks and keeps the food and the age it has now
+        """
+        food, age = animal.food, animal.age
+        animal.scheduler = None
+        animal.food, animal.age = food, age
+        if self.animals.get(animal.id) is animal:
+            del self.animals[animal.id]
+            self.forget(self.names, animal.name, animal.id)
+            self.forget(self.species, type(animal), animal.id)
+            self.by_food.remove(animal)
+            self.by_age.remove(animal)
+
+    @staticmethod
+    def forget(index: dict, key, animal_id: int):
+        bucket = index[key]
+        del bucket[animal_id]
+        if not bucket:
+            del index[key]
+
+    def rebuild(self, anim):
+        """
+        Follows exactly the given animals, after the animals of the tank were replaced
+        """
+        for animal in list(self.animals.values()):
+            if animal.scheduler is self:
+                self.remove(animal)
+        self.animals, self.starving, self.old, self.hungry = {}, [], [], {}
+        self.names, self.species, self.by_food, self.by_age = {}, {}, Buckets(), Buckets()
+        for animal in anim:
+            self.add(animal)
+
+    def schedule_food(self, animal: Animal):
+        # the entry left by the former food base is dropped when it comes up, see current.
+        heapq.heappush(self.starving, (animal.food_base, animal.id))
+        self.by_food.move(animal, animal.food_base)
+        if len(self.starving) > 2 * len(self.animals) + 64:
+            self.starving = [(other.food_base, other.id) for other in self.animals.values()]
+            heapq.heapify(self.starving)
+
+    def schedule_age(self, animal: Animal):
+        heapq.heappush(self.old, (-animal.age_base, animal.id))
+        self.by_age.move(animal, animal.age_base)
+        if len(self.old) > 2 * len(self.animals) + 64:
+            self.reschedule_ages()
+
+    def reschedule_ages(self):
+        self.old = [(-other.age_base, other.id) for other in self.animals.values()]
+        heapq.heapify(self.old)
+
+    def current(self, animal_id: int, food_base=None, age_base=None):
+        """
+        Returns the animal of a heap entry, None if the entry is out of date
+        """
+        animal = self.animals.get(animal_id)
+        if animal is None or animal.scheduler is not self:
+            return None
+        if food_base is not None and animal.food_base != food_base:
+            return None
+        if age_base is not None and animal.age_base != age_base:
+            return None
+        return animal
+
+    def named(self, name: str):
+        """
+        Returns the animal with that name (the first one in if there are more), None if there is none
+        """
+        bucket = self.names.get(name)
+        return bucket[min(bucket)] if bucket else None
+
+    def starving_below(self, food: int) -> list:
+        """
+        Returns the animals with less than food food, by id
+        """
+        return self.by_food.below(food + self.hunger)
+
+    def older_than(self, age: int) -> list:
+        """
+        Returns the animals older than age, by id
+        """
+        return self.by_age.above(age - self.years)
+
+    def feed(self, amount: int):
+        """
+        Gives amount food to every animal
+        """
+        self.hunger -= amount
+        for animal_id, food_base in list(self.hungry.items()):
+            if food_base > self.hunger:  # it has food again, it can starve again.
+                del self.hungry[animal_id]
+                heapq.heappush(self.starving, (food_base, animal_id))
+
+    def tick(self, age=False, max_age=Animal.MAX_AGE) -> dict:
+        """
+        Every animal eats once and gets a year older if age is set, like dec_food and inc_age.
+        Returns the cause of every death by id, the animals that die have left the clocks
+        """
+        dying = {}
+        self.hunger += 1
+        heap = self.starving
+        while heap and heap[0][0] <= self.hunger:
+            food_base, animal_id = heapq.heappop(heap)
+            animal = self.current(animal_id, food_base=food_base)
+            if animal is None:
+                continue
+            if food_base == self.hunger:  # its food just went from 1 to 0.
+                dying[animal_id] = 'starvation'
+                self.remove(animal)
+            else:
+                self.hungry[animal_id] = food_base
+        if not age:
+            return dying
+
+        if max_age != self.max_age:
+            self.max_age = max_age
+            self.reschedule_ages()
+        self.years += 1
+        limit = max_age - self.years  # the age base of the animals reaching max_age now.
+        heap = self.old
+        while heap and -heap[0][0] >= limit:
+            age_base, animal_id = heapq.heappop(heap)
+            animal = self.current(animal_id, age_base=-age_base)
+            if animal is not None and -age_base == limit:
+                dying[animal_id] = 'age'
+                self.remove(animal)
+            # an animal already older than max_age never dies of old age, like in inc_age.
+        return dying
+
+    def next_deaths(self, max_age=Animal.MAX_AGE) -> (int, int):
+        """
+        Returns how many ticks until the first animal starves and how many years until the first
+        animal dies of old age, None when nobody will
+        """
+        heap = self.starving
+        while heap:
+            food_base, animal_id = heap[0]
+            animal = self.current(animal_id, food_base=food_base)
+            if animal is not None and food_base > self.hunger:
+                break
+            heapq.heappop(heap)
+            if animal is not None:  # at 0 food or under, the next tick would put it there anyway.
+                self.hungry[animal_id] = food_base
+        ticks = heap[0][0] - self.hunger if heap else None
+
+        if max_age != self.max_age:
+            self.max_age = max_age
+            self.reschedule_ages()
+        heap = self.old
+        while heap:
+            key, animal_id = heap[0]  # the key is minus the age base.
+            if self.current(animal_id, age_base=-key) is not None and max_age - self.years + key >= 1:
+                break
+            heapq.heappop(heap)  # out of date, or already older than max_age for good.
+        years = max_age - self.years + heap[0][0] if heap else None
+        return ticks, years
+
+    def skip(self, ticks: int, years: int):
+        """
+        Moves the clocks ahead at once, only when nobody dies on the way (see next_deaths)
+        """
+        self.hunger += ticks
+        self.years += years
@@ -1,20 +1,19 @@
+import Board
 import Fish
 
+MOLY = (
+    '*   *** ',
+    '********',
+    '*   *** '
+)
+
 
 class Moly(Fish.Fish):
+    __slots__ = ()
+    width = 8
+    height = 3
+    lines = {1: MOLY, 0: tuple(i[::-1] for i in MOLY)}  # 0 is a moly looking left.
+    sprites = {direction: Board.make_block(looks) for direction, looks in lines.items()}
+
     def __init__(self, name, age, x, y, directionH, directionV):
         super().__init__(name, age, x, y, directionH, directionV)
-        self.width = 8
-        self.height = 3
-
-    def get_animal(self):
-        moly = [
-            '*   *** ',
-            '********',
-            '*   *** '
-        ]
-
-        if self.directionH == 0:
-            moly = [i[::-1] for i in moly]  # a moly looking left.
-
-        return moly
@@ -1,17 +1,20 @@
+import Board
 import Crab
 
+OCYPODE = (
+    ' *   * ',
+    '  ***  ',
+    '*******',
+    '*     *'
+)
+
 
 class Ocypode(Crab.Crab):
+    __slots__ = ()
+    width = 7
+    height = 4
+    lines = {1: OCYPODE, 0: OCYPODE}  # an ocypode looks the same both ways.
+    sprites = {direction: Board.make_block(looks) for direction, looks in lines.items()}
+
     def __init__(self, name, age, x, y, directionH):
         super().__init__(name, age, x, y, directionH)
-        self.width = 7
-        self.height = 4
-
-    def get_animal(self):
-        ocypode = [
-            ' *   * ',
-            '  ***  ',
-            '*******',
-            '*     *'
-                   ]
-        return ocypode
@@ -0,0 +1,70 @@
+import sys
+
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+
+
+def move_to(row: int, col: int) -> str:
+    """
+    Returns the ANSI sequence that moves the cursor (both start at 1)
+    """
+    return f'\x1b[{row};{col}H'
+
+
+class Renderer:
+    """
+    Draws a board on a terminal, and after the first frame only the spans that changed.
+    Every frame is built in memory and written at once.
+    """
+
+    def __init__(self, board, stream=None):
+        self.board = board
+        self.stream = stream if stream is not None else sys.stdout
+        self.front = None  # the rows the terminal shows right now.
+        board.dirty = []
+
+    def close(self):
+        """
+        Stops following the board, the next frame will be a full one again
+        """
+        self.board.dirty = None
+        self.front = None
+
+    def frame(self) -> int:
+        """
+        Writes the changes since the last frame, returns the number of characters written
+        """
+        board = self.board
+        if self.front is None or len(self.front) != board.height:
+            self.front = [board.row_string(y) for y in range(board.height)]
+            parts = [CLEAR_SCREEN, '\n'.join(' '.join(row) for row in self.front)]
+        else:
+            parts = []
+            for y, (x0, x1) in sorted(self.spans().items()):
+                old, new = self.front[y], board.row_string(y)
+                while x0 < x1 and old[x0] == new[x0]:  # the erase and redraw of a still animal is no change.
+                    x0 += 1
+                while x1 > x0 and old[x1 - 1] == new[x1 - 1]:
+                    x1 -= 1
+                if x0 < x1:
+                    parts.append(move_to(y + 1, 2 * x0 + 1) + ' '.join(new[x0:x1]))
+                    self.front[y] = new
+        board.dirty.clear()
+        parts.append(move_to(board.height + 1, 1))  # leave the cursor under the board.
+
+        frame = ''.join(parts)
+        self.stream.write(frame)
+        self.stream.flush()
+        return len(frame)
+
+    def spans(self) -> dict:
+        """
+        Merges the dirty rectangles into one span of columns for every changed row
+        """
+        width, height = self.board.width, self.board.height
+        spans = {}
+        for x, y, w, h in self.board.dirty:
+            x0, x1 = max(x, 0), min(x + w, width)
+            for row in range(max(y, 0), min(y + h, height)):
+                old = spans.get(row)
+                spans[row] = (x0, x1) if old is None else (min(old[0], x0), max(old[1], x1))
+        return spans
@@ -0,0 +1,148 @@
+import bisect
+import contextlib
+import os
+import sys
+
+import Aqua
+import Crab
+import Events
+import Snapshot
+
+EVENTS = 'events.jsonl'
+INDEX = 'keyframes.txt'  # a line per keyframe: the turn and the offset of that turn in the event log.
+
+
+def keyframe_path(directory, turn):
+    return os.path.join(directory, 'keyframe-%d.snap' % turn)
+
+
+class Recorder:
+    """
+    Records a run in a directory: a keyframe (a snapshot of the tank) every keyframe_every turns
+    and the events of every turn in between, so the run can be replayed from any turn
+    """
+
+    def __init__(self, aqua, directory, keyframe_every=1000):
+        self.aqua = aqua
+        self.directory = directory
+        self.keyframe_every = keyframe_every
+        os.makedirs(directory, exist_ok=True)
+        if any(os.path.exists(os.path.join(directory, name)) for name in (EVENTS, INDEX)):
+            # the keyframes are named by turn, a second recording would be mixed with the first one.
+            raise FileExistsError(f"There is already a recording in {directory}")
+        self.log = open(os.path.join(directory, EVENTS), 'w', encoding='utf-8', newline='\n')
+        self.index = open(os.path.join(directory, INDEX), 'w', encoding='utf-8')
+        self.listener = aqua.subscribe(Events.EventLog(self.log, skip_empty=False))
+        self.keyframe()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def keyframe(self):
+        self.log.flush()
+        Snapshot.save(self.aqua, keyframe_path(self.directory, self.aqua.turn), board=False)
+        self.index.write('%d %d\n' % (self.aqua.turn, self.log.tell()))
+        self.index.flush()
+
+    def run(self, steps, feed_every=0, quiet=True):
+        """
+        Runs steps turns like Aqua.run, the death messages are not printed unless quiet is False
+        """
+        aqua = self.aqua
+        with contextlib.redirect_stdout(None if quiet else sys.stdout):
+            for i in range(steps):
+                if feed_every and i % feed_every == 0:
+                    aqua.feed_all()
+                aqua.next_turn()
+                if aqua.turn % self.keyframe_every == 0:
+                    self.keyframe()
+
+    def close(self):
+        if self.listener in self.aqua.listeners:
+            self.aqua.unsubscribe(self.listener)
+        self.log.close()
+        self.index.close()
+
+
+class Replay:
+    """
+    Rebuilds the tank of a recorded run at any turn: from the last keyframe before the turn
+    and the events recorded after it
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.keyframes, self.offsets = [], []
+        with open(os.path.join(directory, INDEX), encoding='utf-8') as index:
+            for line in index:
+                turn, offset = map(int, line.split())
+                if self.keyframes and turn <= self.keyframes[-1]:
+                    raise ValueError(f"The keyframes of {directory} do not follow each other (turn {turn})")
+                self.keyframes.append(turn)
+                self.offsets.append(offset)
+
+    def turns(self, start=None):
+        """
+        Yields (turn, events) for every recorded turn from start, reading from the closest keyframe
+        """
+        start = self.keyframes[0] if start is None else start
+        k = max(bisect.bisect_right(self.keyframes, start) - 1, 0)
+        with open(os.path.join(self.directory, EVENTS), encoding='utf-8', newline='\n') as log:
+            log.seek(self.offsets[k])
+            for turn, events in Events.read(log):
+                if turn >= start:
+                    yield turn, events
+
+    def seek(self, turn) -> Aqua.Aqua:
+        """
+        Returns the tank as it was at the beginning of the given turn
+        """
+        k = bisect.bisect_right(self.keyframes, turn) - 1
+        if k < 0:
+            raise ValueError(f"The recording starts at turn {self.keyframes[0]}")
+        aqua = Snapshot.load(keyframe_path(self.directory, self.keyframes[k]))
+        animals = {animal.id: animal for animal in aqua.anim}
+        with open(os.path.join(self.directory, EVENTS), encoding='utf-8', newline='\n') as log:
+            log.seek(self.offsets[k])
+            for event_turn, events in Events.read(log):
+                if event_turn >= turn:
+                    break
+                for event in events:
+                    apply(aqua, animals, event)
+                aqua.turn = event_turn + 1
+        if aqua.turn != turn:
+            raise ValueError(f"The recording ends before turn {turn}")
+
+        aqua.scheduler.rebuild(aqua.anim)
+        aqua.crabs.rebuild(animal for animal in aqua.anim if isinstance(animal, Crab.Crab))
+        aqua.board_stale = True
+        return aqua
+
+
+def apply(aqua, animals, event):
+    """
+    Brings the tank up to date with a recorded event, every event has the whole state of its animal
+    """
+    if event.kind == 'added':
+        animal = aqua.create(event.name, event.age, event.x, event.y, event.directionH, event.directionV, event.detail)
+        animal.id, animal.food = event.id, event.food
+        aqua.anim.append(animal)
+        aqua.next_id = max(aqua.next_id, event.id + 1)
+        animals[event.id] = animal
+        return None
+    animal = animals.get(event.id)
+    if animal is None:
+        return None
+    if event.kind == 'died':
+        del animals[event.id]
+        aqua.anim.discard(event.id)
+        aqua.deaths[event.detail] += 1
+        aqua.last_death = event.turn
+        return None
+    animal.x, animal.y, animal.directionH = event.x, event.y, event.directionH
+    animal.food, animal.age = event.food, event.age
+    if not isinstance(animal, Crab.Crab):
+        animal.directionV = event.directionV
@@ -1,22 +1,21 @@
+import Board
 import Fish
 
+SCALAR = (
+    '******  ',
+    '    *** ',
+    '  ******',
+    '    *** ',
+    '******  '
+)
+
 
 class Scalar(Fish.Fish):
+    __slots__ = ()
+    width = 8
+    height = 5
+    lines = {1: SCALAR, 0: tuple(i[::-1] for i in SCALAR)}  # 0 is a scalar looking left.
+    sprites = {direction: Board.make_block(looks) for direction, looks in lines.items()}
+
     def __init__(self, name, age, x, y, directionH, directionV):
         super().__init__(name, age, x, y, directionH, directionV)
-        self.width = 8
-        self.height = 5
-
-    def get_animal(self):
-        scalar = [
-            '******  ',
-            '    *** ',
-            '  ******',
-            '    *** ',
-            '******  '
-                ]
-
-        if self.directionH == 0:  # if we need a scalar looking left.
-            scalar = [i[::-1] for i in scalar]
-
-        return scalar
@@ -0,0 +1,182 @@
+import bisect
+import copy
+import multiprocessing
+import os
+
+import Aqua
+import Crab
+
+
+def run_shard(aqua, turn, steps, feed_every=0, start=0):
+    """
+    Runs steps turns of a shard from the given turn with Aqua.run, the animals are fed when
+    (start + i) is a multiple of feed_every, like in a run of the whole aquarium
+    """
+    aqua.turn = turn
+    first = min(-start % feed_every, steps) if feed_every else steps  # the turns before the first feeding.
+    if first:
+        aqua.run(first)
+    if first < steps:
+        aqua.run(steps - first, feed_every=feed_every)
+
+
+def work(conn, width, height, feed_amount, max_age, sparse=False):
+    """
+    The loop of a worker process, it owns the fish of one strip of the tank
+    """
+    aqua = Aqua.Aqua(width, height, sparse)
+    aqua.feed_amount, aqua.max_age = feed_amount, max_age
+    while True:
+        command, *args = conn.recv()
+        if command == 'add':
+            for animal in args[0]:
+                aqua.insert(animal)
+            aqua.anim.sort(key=lambda animal: animal.id)  # the handed off fish keep the aquarium order.
+            conn.send(len(aqua.anim))
+        elif command == 'run':
+            run_shard(aqua, *args)
+            conn.send(len(aqua.anim))
+        elif command == 'leaving':
+            low, high = args
+            leaving = [animal for animal in aqua.anim if not low <= animal.x < high]
+            if leaving:
+                aqua.anim[:] = [animal for animal in aqua.anim if low <= animal.x < high]
+                aqua.scheduler.rebuild(aqua.anim)
+            conn.send(leaving)
+        elif command == 'animals':
+            conn.send((aqua.anim, aqua.deaths, aqua.last_death))
+        else:
+            break
+    conn.close()
+
+
+class ShardedAqua:
+    """
+    Runs an aquarium on several processes. The tank is split into vertical strips and the fish
+    of every strip are moved by a worker process, the fish that swam into another strip are handed
+    off to its worker at every barrier. The crabs stay together in this process: a crab collision
+    depends on every crab that moved before it in the same turn, so the floor lane cannot be split
+    without changing the result. It is moved while the workers move the fish
+    """
+
+    def __init__(self, aqua, workers=None):
+        self.aqua = aqua
+        self.turn = aqua.turn
+        workers = workers or min(os.cpu_count() or 1, 8)
+        width = aqua.aqua_width
+        self.bounds = [width * k // workers for k in range(workers + 1)]  # strip k is [bounds[k], bounds[k + 1]).
+        self.originals = {animal.id: animal for animal in aqua.anim}
+        self.deaths, self.last_death = dict(aqua.deaths), aqua.last_death  # before the workers took over.
+
+        # copies of the crabs, moved here like the fish by the workers.
+        self.floor = Aqua.Aqua(width, aqua.aqua_height, aqua.sparse)
+        self.floor.feed_amount, self.floor.max_age = aqua.feed_amount, aqua.max_age
+        strips = [[] for _ in range(workers)]
+        for animal in aqua.anim:
+            if isinstance(animal, Crab.Crab):
+                self.floor.insert(copy.copy(animal))
+            else:
+                strips[self.strip(animal.x)].append(animal)
+
+        self.conns, self.processes = [], []
+        for strip in strips:
+            conn, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=work, daemon=True,
+                                              args=(child, width, aqua.aqua_height, aqua.feed_amount, aqua.max_age,
+                                                    aqua.sparse))
+            process.start()
+            child.close()
+            conn.send(('add', strip))
+            self.conns.append(conn)
+            self.processes.append(process)
+        for conn in self.conns:
+            conn.recv()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def strip(self, x: int) -> int:
+        """
+        Returns the strip of the column x
+        """
+        return min(max(bisect.bisect_right(self.bounds, x) - 1, 0), len(self.bounds) - 2)
+
+    def run(self, steps, feed_every=0, sync_every=50):
+        """
+        Runs steps turns, the workers meet every sync_every turns to hand off the fish.
+        The animals are fed every feed_every turns, counted like Aqua.run
+        """
+        done = 0
+        while done < steps:
+            chunk = min(sync_every or steps, steps - done)
+            for conn in self.conns:
+                conn.send(('run', self.turn, chunk, feed_every, done))
+            run_shard(self.floor, self.turn, chunk, feed_every, done)
+            for conn in self.conns:
+                conn.recv()
+            self.turn += chunk
+            done += chunk
+            self.hand_off()
+        self.gather()
+
+    def hand_off(self):
+        """
+        The turn barrier: every worker gives away the fish that left its strip
+        """
+        for k, conn in enumerate(self.conns):
+            conn.send(('leaving', self.bounds[k], self.bounds[k + 1]))
+        arriving = [[] for _ in self.conns]
+        for conn in self.conns:
+            for animal in conn.recv():
+                arriving[self.strip(animal.x)].append(animal)
+        for conn, animals in zip(self.conns, arriving):
+            conn.send(('add', animals))
+        for conn in self.conns:
+            conn.recv()
+
+    def gather(self):
+        """
+        Writes the animals back into the aquarium and composes its board
+        """
+        for conn in self.conns:
+            conn.send(('animals',))
+        replies = [(self.floor.anim, self.floor.deaths, self.floor.last_death)]
+        replies.extend(conn.recv() for conn in self.conns)
+
+        aqua = self.aqua
+        aqua.deaths, aqua.last_death = dict(self.deaths), self.last_death
+        animals = []
+        for shard_animals, deaths, last_death in replies:
+            animals.extend(shard_animals)
+            for cause, count in deaths.items():
+                aqua.deaths[cause] += count
+            if last_death is not None:
+                aqua.last_death = max(last_death, aqua.last_death or 0)
+        animals.sort(key=lambda animal: animal.id)
+
+        anim = []
+        for animal in animals:
+            original = self.originals[animal.id]
+            if original is not animal:  # the copy that came back from a worker or the floor.
+                for cls in type(animal).__mro__:
+                    for slot in getattr(cls, '__slots__', ()):
+                        setattr(original, slot, getattr(animal, slot))
+            anim.append(original)
+        aqua.anim[:] = anim
+        aqua.scheduler.rebuild(anim)
+        aqua.spatial = None
+        aqua.crabs.rebuild(animal for animal in anim if isinstance(animal, Crab.Crab))
+        aqua.turn = self.turn
+        aqua.board_stale = True
+        return aqua
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(('stop',))
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.conns, self.processes = [], []
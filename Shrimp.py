@@ -1,20 +1,19 @@
+import Board
 import Crab
 
+SHRIMP = (
+    '    * *',
+    '****** ',
+    '  * *  '
+)
+
 
 class Shrimp(Crab.Crab):
+    __slots__ = ()
+    width = 7
+    height = 3
+    lines = {1: SHRIMP, 0: tuple(i[::-1] for i in SHRIMP)}  # 0 is a shrimp looking left.
+    sprites = {direction: Board.make_block(looks) for direction, looks in lines.items()}
+
     def __init__(self, name, age, x, y, directionH):
         super().__init__(name, age, x, y, directionH)
-        self.width = 7
-        self.height = 3
-
-    def get_animal(self):
-        shrimp = [
-            '    * *',
-            '****** ',
-            '  * *  '
-                ]
-
-        if self.directionH == 0:
-            shrimp = [i[::-1] for i in shrimp]  # a shrimp looking left.
-
-        return shrimp
@@ -0,0 +1,103 @@
+class SlotMap:
+    """
+    The animals of the aquarium in the order they came in, with their ids as handles: an animal is
+    found or taken out by its id without going through the others. A removed animal leaves a hole
+    that the next pass over the animals closes, so the others never change order (it is the order
+    they are drawn in and they bump into each other in). Use it like the list it replaces, but do
+    not remove animals while going through them
+    """
+
+    def __init__(self, animals=()):
+        self.slots = []  # the animals in the order they came in, None where one was removed.
+        self.slot_of = {}  # id -> the index of its slot.
+        self.holes = 0
+        self.extend(animals)
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __iter__(self):
+        if self.holes:
+            self.compact()
+        return iter(self.slots)
+
+    def __getitem__(self, index):
+        if self.holes:
+            self.compact()
+        return self.slots[index]
+
+    def __setitem__(self, index, animals):
+        """
+        Replaces all the animals at once, anim[:] = animals
+        """
+        if index != slice(None):
+            raise TypeError("Only all the animals can be replaced at once")
+        animals = list(animals)
+        self.clear()
+        self.extend(animals)
+
+    def __contains__(self, animal) -> bool:
+        return self.get(animal.id) is animal
+
+    def __repr__(self):
+        return f"SlotMap({list(self)!r})"
+
+    def get(self, animal_id: int):
+        """
+        Returns the animal with that id, None if there is none
+        """
+        slot = self.slot_of.get(animal_id)
+        return None if slot is None else self.slots[slot]
+
+    def append(self, animal):
+        if animal.id in self.slot_of:
+            raise ValueError(f"There is already an animal with the id {animal.id}")
+        self.slot_of[animal.id] = len(self.slots)
+        self.slots.append(animal)
+
+    def extend(self, animals):
+        for animal in animals:
+            self.append(animal)
+
+    def remove(self, animal):
+        if animal not in self:
+            raise ValueError(f"{animal!r} is not in the aquarium")
+        self.discard(animal.id)
+
+    def discard(self, animal_id: int):
+        """
+        Takes out the animal with that id and returns it, None if there is none
+        """
+        slot = self.slot_of.pop(animal_id, None)
+        if slot is None:
+            return None
+        animal, self.slots[slot] = self.slots[slot], None
+        self.holes += 1
+        return animal
+
+    def index(self, animal) -> int:
+        if animal not in self:
+            raise ValueError(f"{animal!r} is not in the aquarium")
+        if self.holes:
+            self.compact()
+        return self.slot_of[animal.id]
+
+    def sort(self, key=None):
+        if self.holes:
+            self.compact()
+        self.slots.sort(key=key)
+        self.reindex()
+
+    def clear(self):
+        self.slots, self.slot_of, self.holes = [], {}, 0
+
+    def compact(self):
+        """
+        Closes the holes in one pass, a new list so a pass already going on is not disturbed
+        """
+        self.slots = [animal for animal in self.slots if animal is not None]
+        self.reindex()
+
+    def reindex(self):
+        self.slot_of = {animal.id: slot for slot, animal in enumerate(self.slots)}
+        self.holes = 0
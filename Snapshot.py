@@ -0,0 +1,103 @@
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # without numpy the records are read with struct.
+    np = None
+
+import Aqua
+import Crab
+
+MAGIC = b'AQUASNAP'
+VERSION = 1
+# magic, version, width, height, turn, count, next_id, feed_amount, max_age,
+# starvation deaths, old age deaths, last death (-1 for none), has board, sparse.
+HEADER = struct.Struct('<8sIIIqqqqqqqq??6x')
+# id, name, type, alive, age, x, y, directionH, directionV, food.
+RECORD = struct.Struct('<Q32s2s?5x6q')
+NAME_SIZE = 32
+if np is not None:
+    RECORD_DTYPE = np.dtype([('id', '<u8'), ('name', 'S32'), ('code', 'S2'), ('alive', '?'), ('pad', 'V5'),
+                             ('age', '<i8'), ('x', '<i8'), ('y', '<i8'), ('directionH', '<i8'),
+                             ('directionV', '<i8'), ('food', '<i8')])
+
+
+def save(aqua, path, board=True):
+    """
+    Writes the aquarium to path: a header, a fixed-width record per animal and the board if asked
+    (never for a sparse tank, it is drawn again). Everything is packed before the file is written
+    next to path and renamed, so a bad field or a crash never leaves half a snapshot
+    """
+    anim = aqua.get_all_animal()
+    board = board and not aqua.sparse
+    header = HEADER.pack(MAGIC, VERSION, aqua.aqua_width, aqua.aqua_height, aqua.turn, len(anim), aqua.next_id,
+                         aqua.feed_amount, aqua.max_age, aqua.deaths['starvation'], aqua.deaths['age'],
+                         -1 if aqua.last_death is None else aqua.last_death, board, aqua.sparse)
+    records = bytearray(RECORD.size * len(anim))
+    for i, animal in enumerate(anim):
+        name = str(animal.name).encode('utf-8')
+        if len(name) > NAME_SIZE:
+            raise ValueError(f"The name {animal.name!r} is longer than {NAME_SIZE} bytes")
+        RECORD.pack_into(records, i * RECORD.size, animal.id, name, Aqua.CODES[type(animal)].encode(),
+                         animal.alive, animal.age, animal.x, animal.y, animal.directionH,
+                         getattr(animal, 'directionV', 0), animal.food)
+    cells = aqua.refresh_board().to_bytes() if board else b''
+
+    tmp = os.fspath(path) + '.tmp'
+    try:
+        with open(tmp, 'wb') as file:
+            file.write(header)
+            file.write(records)
+            file.write(cells)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def read_records(buffer, count):
+    """
+    Returns the columns of the animal records as lists, straight from the mapped file
+    """
+    if np is not None:
+        records = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+        return [records[name].tolist() for name in RECORD_DTYPE.names if name != 'pad']
+    rows = struct.iter_unpack(RECORD.format, buffer[HEADER.size:HEADER.size + count * RECORD.size])
+    return list(zip(*rows)) or [[] for _ in range(10)]
+
+
+def load(path):
+    """
+    Returns the aquarium saved in path. The records are read at once from the mapped file, but every
+    animal is then built and indexed one by one: loading is O(n) Python work in the number of animals
+    """
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        (magic, version, width, height, turn, count, next_id, feed_amount, max_age,
+         starvation, old, last_death, board, sparse) = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an aquarium snapshot")
+
+        aqua = Aqua.Aqua(width, height, sparse)
+        aqua.turn, aqua.next_id, aqua.feed_amount, aqua.max_age = turn, next_id, feed_amount, max_age
+        aqua.deaths = {'starvation': starvation, 'age': old}
+        aqua.last_death = None if last_death < 0 else last_death
+
+        columns = read_records(buffer, count)
+        for animal_id, name, code, alive, age, x, y, directionH, directionV, food in zip(*columns):
+            animal = aqua.create(name.rstrip(b'\0').decode('utf-8'), age, x, y, directionH, directionV,
+                                 code.decode())
+            animal.id, animal.food, animal.alive = animal_id, food, alive
+            aqua.anim.append(animal)
+        aqua.scheduler.rebuild(aqua.anim)
+        aqua.crabs.rebuild(animal for animal in aqua.anim if isinstance(animal, Crab.Crab))
+
+        if board:
+            start = HEADER.size + count * RECORD.size
+            aqua.board.fill(buffer[start:start + width * height])
+            aqua.drawn = None  # the animals are on the board, but where they were drawn is not kept.
+        else:
+            aqua.board_stale = True
+    return aqua
@@ -0,0 +1,66 @@
+CELL_SIZE = 8  # the size of an animal, most animals are found in one or two cells.
+
+
+class SpatialIndex:
+    """
+    Index of the animals by their position, bucketed in square cells, so the animals in a
+    rectangle are found by looking at the cells under it instead of at every animal
+    """
+
+    def __init__(self, size=CELL_SIZE):
+        self.size = size
+        self.at = {}  # (column, row) of a cell -> the animals in it by id.
+        self.where = {}  # id -> the position the animal is indexed at.
+
+    def __len__(self):
+        return len(self.where)
+
+    def cell(self, x: int, y: int) -> (int, int):
+        return x // self.size, y // self.size
+
+    def move(self, animal, x: int, y: int):
+        """
+        Indexes the animal at the position (x, y), it can be new to the index
+        """
+        old = self.where.get(animal.id)
+        if old == (x, y):
+            return None
+        self.where[animal.id] = (x, y)
+        cell = self.cell(x, y)
+        if old is not None:
+            old_cell = self.cell(*old)
+            if old_cell == cell:
+                return None
+            self.discard(animal.id, old_cell)
+        self.at.setdefault(cell, {})[animal.id] = animal
+
+    def remove(self, animal):
+        old = self.where.pop(animal.id, None)
+        if old is not None:
+            self.discard(animal.id, self.cell(*old))
+
+    def discard(self, animal_id: int, cell):
+        bucket = self.at[cell]
+        del bucket[animal_id]
+        if not bucket:
+            del self.at[cell]
+
+    def query(self, x0: int, x1: int, y0: int, y1: int) -> list:
+        """
+        Returns the animals at the columns x0 to x1 and the rows y0 to y1 (the ends excluded), by id
+        """
+        if x1 <= x0 or y1 <= y0:
+            return []
+        (c0, r0), (c1, r1) = self.cell(x0, y0), self.cell(x1 - 1, y1 - 1)
+        if (c1 - c0 + 1) * (r1 - r0 + 1) > len(self.at):  # a large rectangle, the cells in use are fewer.
+            cells = [cell for cell in self.at if c0 <= cell[0] <= c1 and r0 <= cell[1] <= r1]
+        else:
+            cells = [(c, r) for c in range(c0, c1 + 1) for r in range(r0, r1 + 1) if (c, r) in self.at]
+        found = []
+        for cell in cells:
+            for animal_id, animal in self.at[cell].items():
+                x, y = self.where[animal_id]
+                if x0 <= x < x1 and y0 <= y < y1:
+                    found.append(animal)
+        found.sort(key=lambda animal: animal.id)
+        return found
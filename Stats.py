@@ -0,0 +1,151 @@
+import collections
+import sys
+import time
+
+COUNTERS = ('collisions', 'deaths', 'redraws')  # None for the turns that do not measure them.
+
+# (method, phase, counter, amount): the methods of the aquarium that are timed when the stats are on,
+# the counter grows by amount(result) after every call.
+AQUA_PHASES = (
+    ('next_turn', 'turn', None, None),
+    ('lifecycle', 'lifecycle', 'deaths', len),
+    ('up', 'movement', None, None),
+    ('down', 'movement', None, None),
+    ('left', 'movement', None, None),
+    ('right', 'movement', None, None),
+    ('is_collision', 'collision', 'collisions', bool),
+    ('redraw', 'redraw', 'redraws', int),
+)
+# the engine has no redraw: the board is drawn once at the end of a run, its turns count no redraws.
+ENGINE_PHASES = (
+    ('next_turn', 'turn', None, None),
+    ('lifecycle', 'lifecycle', 'deaths', lambda dying: int(dying.sum())),
+    ('move_fish', 'movement', None, None),
+    ('move_crabs', 'movement', None, None),
+    ('is_collision', 'collision', 'collisions', bool),
+)
+
+
+class Stats:
+    """
+    Times the phases of every turn and keeps the last turns in a ring buffer.
+    The time of a phase does not include the phases called from it (a collision is not movement)
+    """
+
+    def __init__(self, capacity=1000, summary_every=0, stream=None):
+        self.turns = collections.deque(maxlen=capacity)  # the oldest turns fall off.
+        self.summary_every = summary_every
+        self.stream = stream
+        self.count = 0  # the turns recorded since the stats were turned on.
+        self.record = None
+        self.stack = []  # [phase, start, time spent in the phases called from it].
+        self.wrapped = []
+
+    def instrument(self, obj, phases):
+        """
+        Replaces the methods of obj by timed ones, the class is not touched
+        """
+        counters = {counter for method, phase, counter, amount in phases if counter is not None}
+        for method, phase, counter, amount in phases:
+            function = getattr(obj, method)
+            if phase == 'turn':
+                setattr(obj, method, self.timed_turn(obj, function, counters))
+            else:
+                setattr(obj, method, self.timed(phase, function, counter, amount))
+            self.wrapped.append((obj, method))
+
+    def uninstrument(self, obj=None):
+        """
+        Puts back the methods of obj (of every object by default)
+        """
+        for wrapped, method in self.wrapped:
+            if obj is None or wrapped is obj:
+                wrapped.__dict__.pop(method, None)
+        self.wrapped = [(wrapped, method) for wrapped, method in self.wrapped if obj is not None and wrapped is not obj]
+
+    def timed(self, phase, function, counter=None, amount=None):
+        def wrapper(*args, **kwargs):
+            self.enter(phase)
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                self.leave()
+            if counter is not None and self.record is not None:
+                self.record[counter] += amount(result)
+            return result
+        return wrapper
+
+    def timed_turn(self, obj, function, counters=COUNTERS):
+        def wrapper(*args, **kwargs):
+            self.begin_turn(obj.turn, counters)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.end_turn()
+        return wrapper
+
+    def begin_turn(self, turn, counters=COUNTERS):
+        self.record = {'turn': turn, 'time': 0.0, 'phases': {}}
+        self.record.update((counter, 0 if counter in counters else None) for counter in COUNTERS)
+        self.enter('turn')
+
+    def end_turn(self):
+        self.leave()
+        self.turns.append(self.record)
+        self.record = None
+        self.count += 1
+        if self.summary_every and self.count % self.summary_every == 0:
+            print(self.report(self.summary_every), file=self.stream or sys.stderr)
+
+    def enter(self, phase):
+        self.stack.append([phase, time.perf_counter(), 0.0])
+
+    def leave(self):
+        phase, start, inner = self.stack.pop()
+        elapsed = time.perf_counter() - start
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        if self.record is None:  # called outside of a turn.
+            return None
+        if phase == 'turn':
+            self.record['time'] = elapsed
+            phase = 'other'  # what the turn did outside of the timed phases.
+        timing = self.record['phases'].setdefault(phase, [0.0, 0])
+        timing[0] += elapsed - inner
+        timing[1] += 1
+
+    def summary(self, last=None) -> dict:
+        """
+        Sums the last turns of the ring buffer (all of them by default): the time and the calls
+        of every phase, the average time of a turn and the counters. A counter is None when none
+        of the turns measured it (the redraws of the engine turns)
+        """
+        turns = list(self.turns)[-last:] if last else list(self.turns)
+        summary = {'turns': len(turns), 'first': turns[0]['turn'] if turns else None,
+                   'last': turns[-1]['turn'] if turns else None, 'time': 0.0, 'phases': {}}
+        summary.update((counter, None) for counter in COUNTERS)
+        for record in turns:
+            summary['time'] += record['time']
+            for counter in COUNTERS:
+                if record[counter] is not None:
+                    summary[counter] = (summary[counter] or 0) + record[counter]
+            for phase, (seconds, calls) in record['phases'].items():
+                timing = summary['phases'].setdefault(phase, {'time': 0.0, 'calls': 0})
+                timing['time'] += seconds
+                timing['calls'] += calls
+        summary['per_turn'] = summary['time'] / len(turns) if turns else 0.0
+        return summary
+
+    def report(self, last=None) -> str:
+        """
+        Returns the summary as a single line of text
+        """
+        summary = self.summary(last)
+        if not summary['turns']:
+            return "no turns recorded"
+        phases = ' '.join("%s %.3f ms (%d)" % (phase, timing['time'] * 1000, timing['calls'])
+                          for phase, timing in sorted(summary['phases'].items()))
+        counters = ' '.join("%s %s" % (counter, '-' if summary[counter] is None else summary[counter])
+                            for counter in COUNTERS)
+        return "turns %d-%d: %.3f ms/turn | %s | %s" % (summary['first'], summary['last'],
+                                                         summary['per_turn'] * 1000, phases, counters)
@@ -0,0 +1,43 @@
+import concurrent.futures
+
+import Aqua
+
+
+def build(config):
+    """
+    Returns the aquarium of a config, a dict with the keys: width, height, animals (the specs of
+    Aqua.add_animals) and optionally name, sparse, feed_amount, max_age and feed_every. An Aqua is used as it is
+    """
+    if isinstance(config, Aqua.Aqua):
+        return config
+    aqua = Aqua.Aqua(config['width'], config['height'], config.get('sparse', False))
+    aqua.feed_amount = config.get('feed_amount', Aqua.FEED_AMOUNT)
+    aqua.max_age = config.get('max_age', Aqua.MAX_AGE)
+    aqua.add_animals(config.get('animals', ()))
+    return aqua
+
+
+def run_tank(index, config, steps, feed_every):
+    """
+    Runs a single tank in a worker process and returns its summary
+    """
+    aqua = build(config)
+    if isinstance(config, dict):
+        feed_every = config.get('feed_every', feed_every)
+    aqua.run(steps, feed_every=feed_every)
+    summary = aqua.summary()
+    summary['tank'] = index
+    if isinstance(config, dict) and 'name' in config:
+        summary['name'] = config['name']
+    return summary
+
+
+def run_many(configs, steps, feed_every=0, workers=None):
+    """
+    Runs every tank for steps turns on a pool of processes and yields their summaries
+    (see Aqua.summary) as soon as they are done, 'tank' is the index of the config
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_tank, index, config, steps, feed_every) for index, config in enumerate(configs)]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import io
+import sys
+import threading
+
+import Aqua
+import Renderer
+
+HELP = ("commands: add <sc|mo|sh|oc> <name> <age> <x> [<y> <directionH> <directionV>], feed, step [n], "
+        "pause, resume, speed <seconds>, print, help, quit")
+MESSAGES = 4  # the lines of messages shown under the board.
+
+
+class Viewer:
+    """
+    Runs an aquarium live with asyncio: the turns, the frames and the commands typed in are
+    separate tasks. The frames are drawn at most fps times a second, a turn that comes before
+    the next frame is due is not drawn on its own (the frame is dropped, not the turn)
+    """
+
+    def __init__(self, aqua, tick=0.5, fps=10, feed_every=50, stream=None, input_stream=None, max_turns=0):
+        self.aqua = aqua
+        self.tick = tick  # seconds between two turns.
+        self.fps = fps
+        self.feed_every = feed_every
+        self.stream = stream if stream is not None else sys.stdout
+        self.input_stream = input_stream if input_stream is not None else sys.stdin
+        self.max_turns = max_turns  # stops after this many turns, 0 runs until quit.
+        self.renderer = Renderer.Renderer(aqua.board, self.stream)
+        self.paused = False
+        self.turns = 0
+        self.frames = 0
+        self.dropped = 0
+        self.drawn_turn = aqua.turn
+        self.messages = []
+        self.changed = asyncio.Event()  # set when there is something new to draw.
+        self.done = asyncio.Event()
+
+    def start(self):
+        asyncio.run(self.run())
+
+    async def run(self):
+        self.draw()
+        tasks = [asyncio.ensure_future(task) for task in (self.tick_loop(), self.render_loop(), self.input_loop())]
+        await self.done.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.draw()
+        self.renderer.close()
+
+    async def tick_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.paused:
+                await asyncio.sleep(self.tick)
+                continue
+            started = loop.time()
+            self.step()
+            if self.max_turns and self.turns >= self.max_turns:
+                self.done.set()
+                return None
+            # a heavy turn eats into the wait, the simulation does not wait for the frames.
+            await asyncio.sleep(max(0.0, self.tick - (loop.time() - started)))
+
+    async def render_loop(self):
+        loop = asyncio.get_running_loop()
+        last = None
+        while True:
+            await self.changed.wait()
+            if last is not None:
+                wait = last + 1 / self.fps - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)  # the turns of the meantime come in the same frame.
+            self.changed.clear()
+            last = loop.time()
+            self.draw()
+
+    async def input_loop(self):
+        loop = asyncio.get_running_loop()
+        lines = asyncio.Queue()
+
+        def read():  # input() blocks, so it is read by a thread that never keeps the program alive.
+            for line in self.input_stream:
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+            loop.call_soon_threadsafe(lines.put_nowait, None)
+
+        threading.Thread(target=read, daemon=True).start()
+        while True:
+            line = await lines.get()
+            if line is None:
+                return None
+            self.say(self.command(line))
+
+    def step(self, turns=1):
+        """
+        Runs turns turns, the death messages are shown under the board
+        """
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for _ in range(turns):
+                if self.feed_every and self.aqua.turn % self.feed_every == 0:
+                    self.aqua.feed_all()
+                self.aqua.next_turn()
+                self.turns += 1
+        self.say(*output.getvalue().splitlines())
+        self.changed.set()
+
+    def say(self, *lines):
+        self.messages = (self.messages + [line for line in lines if line])[-MESSAGES:]
+
+    def command(self, line: str) -> str:
+        """
+        Carries out a command typed in, returns the answer to show
+        """
+        words = line.split()
+        if not words:
+            return ''
+        name, args = words[0].lower(), words[1:]
+        if name == 'add':
+            try:
+                spec = self.check_add(*args)
+            except (ValueError, TypeError):
+                return 'bad arguments, ' + HELP
+            return self.add(*spec)  # an error from here on is not about the arguments, it is not hidden.
+        try:
+            if name == 'feed':
+                self.aqua.feed_all()
+                return 'fed all the animals'
+            if name == 'step':
+                self.step(int(args[0]) if args else 1)
+                return 'turn %d' % self.aqua.turn
+            if name in ('pause', 'resume'):
+                self.paused = name == 'pause'
+                return 'paused' if self.paused else 'running'
+            if name == 'speed':
+                self.tick = max(float(args[0]), 0.0)
+                return 'a turn every %g seconds' % self.tick
+            if name == 'print':
+                self.say(*(str(animal) for animal in self.aqua.get_all_animal()))
+                return '%d animals' % len(self.aqua.get_all_animal())
+            if name == 'quit':
+                self.done.set()
+                return 'bye bye'
+        except (ValueError, IndexError, TypeError):
+            return 'bad arguments, ' + HELP
+        return HELP
+
+    def check_add(self, animaltype, name, age, x, y=None, directionH='1', directionV='0') -> tuple:
+        """
+        Returns the arguments of the add command as add_animal takes them, raises ValueError if one
+        is out of range (the same ranges as the menu of main.py)
+        """
+        if animaltype not in Aqua.SPECIES:
+            raise ValueError
+        height, width = self.aqua.aqua_height, self.aqua.aqua_width
+        age, x, directionH, directionV = int(age), int(x), int(directionH), int(directionV)
+        y = int(y) if y is not None else height
+        if not (1 <= age <= 100 and 1 <= x <= width - 1 and directionH in (0, 1) and directionV in (0, 1)):
+            raise ValueError
+        if animaltype in ('sc', 'mo') and not Aqua.WATERLINE <= y <= height - 1:
+            raise ValueError  # the crabs are put on the floor whatever their y.
+        return animaltype, name, age, x, y, directionH, directionV
+
+    def add(self, animaltype, name, age, x, y, directionH, directionV):
+        with contextlib.redirect_stdout(None):
+            added = self.aqua.add_animal(name, age, x, y, directionH, directionV, animaltype)
+        self.changed.set()
+        return 'added %s' % name if added else 'the place is not available'
+
+    def draw(self):
+        """
+        Draws a frame and the status lines under the board
+        """
+        self.dropped += max(self.aqua.turn - self.drawn_turn - 1, 0)
+        self.drawn_turn = self.aqua.turn
+        self.frames += 1
+        self.aqua.refresh_board()
+        self.renderer.frame()
+        status = 'turn %d | %d animals | %d frames, %d dropped%s' % (
+            self.aqua.turn, len(self.aqua.get_all_animal()), self.frames, self.dropped,
+            ' | paused' if self.paused else '')
+        lines = [status] + self.messages + [''] * (MESSAGES - len(self.messages)) + ['> ']
+        self.stream.write('\n'.join('\x1b[K' + line for line in lines))  # each line is cleared first.
+        self.stream.flush()
@@ -0,0 +1,143 @@
+"""
+Benchmarks of the Aqua hot paths, run with:
+    python -m pytest benchmarks --benchmark-autosave
+and compare two commits with --benchmark-compare (the results are kept in .benchmarks/).
+"""
+import contextlib
+import io
+import random
+
+import pytest
+
+from Aqua import Aqua
+
+pytest.importorskip('pytest_benchmark')
+
+SIZES = [(60, 30, 20), (400, 100, 400), (2000, 300, 5000)]  # width, height, animals
+
+
+def populated(width, height, count, seed=0):
+    """
+    A tank of young, well fed animals, so the population stays the same for the whole benchmark
+    """
+    random.seed(seed)
+    aquarium = Aqua(width, height)
+    specs = [("animal%d" % i, random.randint(1, 10), random.randint(1, width - 1), random.randint(3, height - 1),
+              random.randint(0, 1), random.randint(0, 1), random.choice(['sc', 'mo', 'sh', 'oc']))
+             for i in range(count)]
+    aquarium.add_animals(specs)
+    for animal in aquarium.get_all_animal():
+        animal.add_food(10 ** 6)
+    return aquarium
+
+
+def crab_floor(width):
+    """
+    A tank with a crab every 8 columns, walking towards each other
+    """
+    aquarium = Aqua(width, 30)
+    aquarium.add_animals([("crab%d" % x, 5, x, 30, (x // 8) % 2, 0, 'sh') for x in range(1, width - 8, 7)])
+    return aquarium
+
+
+def crowded_floor(width, crabs, seed=0):
+    """
+    A tank with crabs spread over the whole floor and some fish, all well fed, the crabs bump all the time
+    """
+    random.seed(seed)
+    aquarium = Aqua(width, 40)
+    aquarium.max_age = 10 ** 6
+    step = (width - 10) // crabs
+    specs = [("crab%d" % i, 5, 1 + i * step + random.randint(0, step - 9), 40, random.randint(0, 1), 0,
+              random.choice(['sh', 'oc'])) for i in range(crabs)]
+    specs += [("fish%d" % i, 5, random.randint(1, width - 20), random.randint(3, 25), random.randint(0, 1),
+               random.randint(0, 1), random.choice(['sc', 'mo'])) for i in range(50)]
+    aquarium.add_animals(specs)
+    for animal in aquarium.get_all_animal():
+        animal.add_food(10 ** 6)
+    return aquarium
+
+
+@pytest.mark.parametrize('width, height, count', SIZES)
+def test_next_turn(benchmark, width, height, count):
+    aquarium = populated(width, height, count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark(aquarium.next_turn)
+
+
+@pytest.mark.parametrize('width, height, count', SIZES)
+def test_batch_turns(benchmark, width, height, count):
+    aquarium = populated(width, height, count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark(aquarium.batch_turns, 10)
+
+
+@pytest.mark.parametrize('width', [400, 4000])
+def test_is_collision_dense_crabs(benchmark, width):
+    aquarium = crab_floor(width)
+    crabs = list(aquarium.get_all_animal())
+
+    def collide_all():
+        for crab in crabs:
+            aquarium.is_collision(crab)
+
+    benchmark(collide_all)
+
+
+@pytest.mark.parametrize('crabs', [10, 67])
+def test_advance_crowded_floor(benchmark, crabs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark.pedantic(lambda aquarium: aquarium.advance(2000), setup=lambda: ((crowded_floor(2000, crabs),), {}),
+                           rounds=3)
+
+
+@pytest.mark.parametrize('width, height, count', SIZES)
+def test_check_if_free(benchmark, width, height, count):
+    aquarium = populated(width, height, count)
+    random.seed(1)
+    spots = [(random.randint(1, width - 9), random.randint(3, height - 9)) for _ in range(1000)]
+
+    def check_all():
+        for x, y in spots:
+            aquarium.check_if_free(x, y)
+
+    benchmark(check_all)
+
+
+def test_add_animal_throughput(benchmark):
+    random.seed(2)
+    specs = [("animal%d" % i, 5, random.randint(1, 1990), random.randint(3, 290), 1, 0, random.choice(['sc', 'mo']))
+             for i in range(2000)]
+
+    def add_all(aquarium):
+        for spec in specs:
+            aquarium.add_animal(*spec)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark.pedantic(add_all, setup=lambda: ((Aqua(2000, 300),), {}), rounds=5)
+
+
+def test_add_animals_bulk(benchmark):
+    random.seed(2)
+    specs = [("animal%d" % i, 5, random.randint(1, 1990), random.randint(3, 290), 1, 0, random.choice(['sc', 'mo']))
+             for i in range(2000)]
+    benchmark.pedantic(lambda aquarium: aquarium.add_animals(specs), setup=lambda: ((Aqua(2000, 300),), {}), rounds=5)
+
+
+@pytest.mark.parametrize('width, height, count', SIZES[:2])
+def test_print_board_frame(benchmark, width, height, count):
+    aquarium = populated(width, height, count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark(aquarium.print_board)
+
+
+@pytest.mark.parametrize('width, height, count', SIZES[:2])
+def test_incremental_frame(benchmark, width, height, count):
+    aquarium = populated(width, height, count)
+
+    def turn_and_frame():
+        aquarium.next_turn()
+        aquarium.print_board(incremental=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark(turn_and_frame)
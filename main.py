@@ -1,5 +1,7 @@
+import argparse
 import time
 import Aqua
+import Viewer
 
 
 def valid_num_check(word: str, num=0) -> float or bool:
@@ -20,20 +22,23 @@ def valid_num_check(word: str, num=0) -> float or bool:
     return word
 
 
-def demo(myaqua):
+def add_demo_animals(myaqua):
     myaqua.add_animal("scalarfish1", 4, 10, 10, 1, 0, 'sc')
     myaqua.add_animal("molyfish2", 12, 35, 15, 0, 1, 'mo')
     myaqua.add_animal("shrimpcrab1", 3, 20, myaqua.aqua_height, 1, 0, 'sh')
     myaqua.add_animal("ocypodcrab1", 13, 41, myaqua.aqua_height, 0, 0, 'oc')
-    myaqua.print_board()
+
+
+def demo(myaqua):
+    add_demo_animals(myaqua)
+    myaqua.print_board(incremental=True)  # a full frame first, then only the changes are drawn.
 
     for i in range(120):
         if i % 50 == 0:
             myaqua.feed_all()
         myaqua.next_turn()
         if i != 119:  # we want to print the final run once.
-            myaqua.print_board()
-            print('\n')
+            myaqua.print_board(incremental=True)
         time.sleep(0.5)
 
 
@@ -145,8 +150,50 @@ def add_animal(myaqua):
     return None
 
 
+def headless(args):
+    # Runs the demo animals without a terminal, as fast as possible.
+    myaqua = Aqua.Aqua(args.width, args.height)
+    add_demo_animals(myaqua)
+    if args.stats_every:
+        myaqua.enable_stats(summary_every=args.stats_every)
+    myaqua.run(args.headless, render_every=args.render_every, feed_every=args.feed_every)
+    print(f'{len(myaqua.get_all_animal())} animals alive after {myaqua.turn} turns')
+
+
+def live(args):
+    # Runs the demo animals in the live viewer, commands can be typed while they swim.
+    myaqua = Aqua.Aqua(args.width, args.height)
+    add_demo_animals(myaqua)
+    Viewer.Viewer(myaqua, tick=args.tick, fps=args.fps, feed_every=args.feed_every).start()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='The OOP Aquarium')
+    parser.add_argument('--headless', type=int, metavar='STEPS',
+                        help='run STEPS turns of the demo animals at full speed, without the menu')
+    parser.add_argument('--live', action='store_true',
+                        help='run the demo animals in the live viewer, type help for the commands')
+    parser.add_argument('--width', type=int, default=50, help='width of the headless or live aquarium')
+    parser.add_argument('--height', type=int, default=30, help='height of the headless or live aquarium')
+    parser.add_argument('--tick', type=float, default=0.5, help='seconds between two turns in the live viewer')
+    parser.add_argument('--fps', type=float, default=10, help='the most frames a second the live viewer draws')
+    parser.add_argument('--feed-every', type=int, default=50, help='feed all the animals every N turns')
+    parser.add_argument('--render-every', type=int, default=0, help='print the board every N turns')
+    parser.add_argument('--stats-every', type=int, default=0,
+                        help='time the turns and print a summary to stderr every N turns')
+    return parser.parse_args()
+
+
 # Press the green button in the gutter to run the script.
 if __name__ == '__main__':
+    args = parse_args()
+    if args.headless:
+        headless(args)
+        exit()
+    if args.live:
+        live(args)
+        exit()
+
     width = 0
     height = 0
 
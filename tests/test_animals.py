@@ -1,4 +1,8 @@
-from aqua import Aqua
+import Moly
+import Ocypode
+import Scalar
+import Shrimp
+from Aqua import Aqua
 
 def test_add_animal():
     aquarium = Aqua(50, 30)
@@ -9,3 +13,10 @@ def test_invalid_animal():
     aquarium = Aqua(50, 30)
     result = aquarium.add_animal("", -1, 0, 0, -1, -1, 'xx')
     assert result is False, "Invalid animal was incorrectly added"
+
+def test_animals_use_slots():
+    animals = [Scalar.Scalar("s", 1, 10, 10, 1, 0), Moly.Moly("m", 1, 10, 10, 1, 0),
+               Shrimp.Shrimp("sh", 1, 10, 26, 1), Ocypode.Ocypode("o", 1, 10, 26, 1)]
+    assert not any(hasattr(animal, '__dict__') for animal in animals), "An animal still has a __dict__"
+    assert [animal.get_size() for animal in animals] == [(5, 8), (3, 8), (3, 7), (4, 7)], "Wrong sizes"
+    assert animals[0].get_position() == (10, 10), "Wrong position"
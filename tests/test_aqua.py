@@ -0,0 +1,216 @@
+import pickle
+
+import pytest
+
+from Aqua import Aqua
+
+
+def test_check_if_free_uses_the_animal_rectangles():
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+    assert not aquarium.check_if_free(12, 8), "The window overlaps the scalar"
+    assert aquarium.check_if_free(18, 10), "The window is right of the scalar"
+    assert aquarium.spatial.where[aquarium.find("scalar").id] == (10, 10), "The scalar is indexed where it is drawn"
+
+
+def test_check_if_free_follows_the_animals():
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("shrimp", 5, 10, 30, 1, 0, 'sh')
+    assert not aquarium.check_if_free(10, 26), "The shrimp is there"
+    for _ in range(10):
+        aquarium.next_turn()
+    assert aquarium.check_if_free(10, 26) and not aquarium.check_if_free(20, 26), "The grid did not follow"
+
+
+def test_check_if_free_only_looks_at_the_bodies():
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("moorish", 5, 20, 12, -1, 1, 'mo')
+    board = aquarium.get_board()
+    for y in range(3, 25):
+        for x in range(1, 52):
+            window = [cell for row in board[y:y + 8] for cell in row[x:x + 8]]
+            assert aquarium.check_if_free(x, y) == ('*' not in window), "Wrong answer at %d, %d" % (x, y)
+
+
+def test_add_animals_matches_add_animal(capsys):
+    specs = [("animal%d" % i, 5, (i * 7) % 70, 3 + (i * 5) % 22, i % 2, (i // 2) % 2, ['sc', 'mo', 'sh', 'oc'][i % 4])
+             for i in range(60)]
+    specs.append(("nobody", 5, 10, 10, 1, 0, 'xx'))
+    one_by_one, bulk = Aqua(80, 30), Aqua(80, 30)
+    expected = [one_by_one.add_animal(*spec) for spec in specs]
+    capsys.readouterr()
+    assert bulk.add_animals(specs) == expected, "Different animals were accepted"
+    assert capsys.readouterr().out == "", "add_animals should not print"
+    assert bulk.get_board() == one_by_one.get_board(), "The animals were drawn differently"
+
+
+def test_run_is_quiet_and_takes_snapshots(capsys):
+    stepped, ran = Aqua(60, 30), Aqua(60, 30)
+    for aquarium in (stepped, ran):
+        aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+        aquarium.add_animal("shrimp", 5, 10, 30, 1, 0, 'sh')
+    for i in range(120):
+        if i % 50 == 0:
+            stepped.feed_all()
+        stepped.next_turn()
+    capsys.readouterr()
+    snapshots = ran.run(120, feed_every=50, snapshot_every=40)
+    assert capsys.readouterr().out == "", "run should not print"
+    assert [turn for turn, animals in snapshots] == [40, 80, 120], "Wrong snapshot turns"
+    assert snapshots[-1] == stepped.snapshot(), "run drifted from next_turn"
+    assert ran.get_board() == stepped.get_board(), "The board was not redrawn at the end"
+
+
+def test_stats_time_the_phases_of_the_turns():
+    aquarium = Aqua(60, 30)
+    assert aquarium.stats() is None, "The stats are off by default"
+    aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("shrimp", 5, 10, 30, 1, 0, 'sh')
+    aquarium.add_animal("ocypode", 5, 30, 30, 0, 0, 'oc')
+    aquarium.enable_stats(capacity=50)
+    for i in range(80):
+        if i % 30 == 0:
+            aquarium.feed_all()
+        aquarium.next_turn()
+    stats = aquarium.stats()
+    assert stats['turns'] == 50 and stats['first'] == 30 and stats['last'] == 79, "The ring buffer keeps 50 turns"
+    assert {'lifecycle', 'movement', 'collision', 'redraw'} <= set(stats['phases']), "A phase was not timed"
+    assert stats['phases']['redraw']['calls'] == 50 and stats['redraws'] == 150, "One redraw pass of 3 per turn"
+    assert stats['collisions'] > 0, "The crabs walk into each other"
+    assert aquarium.stats(last=10)['turns'] == 10, "Only the last turns"
+
+    aquarium.disable_stats()
+    assert aquarium.stats() is None and 'next_turn' not in vars(aquarium), "The methods were not put back"
+
+
+def test_stats_of_engine_turns_do_not_count_redraws():
+    pytest.importorskip('numpy')
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("shrimp", 5, 10, 30, 1, 0, 'sh')
+    aquarium.add_animal("ocypode", 5, 30, 30, 0, 0, 'oc')
+    aquarium.enable_stats()
+    aquarium.run(40)
+    stats = aquarium.stats()
+    assert stats['turns'] == 40 and stats['collisions'] > 0, "The engine turns were not counted"
+    assert stats['redraws'] is None and 'redraws -' in aquarium.profiler.report(), "The engine does not redraw"
+
+
+def test_pickling_keeps_the_animals_but_not_the_board():
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("shrimp", 5, 10, 30, 1, 0, 'sh')
+    aquarium.max_age = 50
+    aquarium.run(15)
+    state = pickle.dumps(aquarium)
+    assert b'|' * 3 not in state and b'~~~' not in state, "The board was pickled"
+    copy = pickle.loads(state)
+    assert copy.snapshot() == aquarium.snapshot() and copy.max_age == 50, "The animals changed"
+    assert copy.get_board() == aquarium.get_board(), "The board was not drawn again"
+    copy.run(30)
+    aquarium.run(30)
+    assert copy.snapshot() == aquarium.snapshot(), "The copy does not run the same"
+
+
+def test_summary_counts_the_deaths_by_cause():
+    aquarium = Aqua(60, 30)
+    aquarium.max_age = 11
+    aquarium.add_animal("old", 9, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("hungry", 50, 30, 10, 1, 0, 'mo')
+    aquarium.add_animal("shrimp", 1, 10, 30, 1, 0, 'sh')
+    for animal in aquarium.get_all_animal():
+        animal.food = 1 if animal.name == "hungry" else 100
+    aquarium.run(110)
+    summary = aquarium.summary()
+    assert summary['deaths'] == {'starvation': 1, 'age': 1}, "Wrong causes"
+    assert summary['last_death'] == 100 and summary['survivors'] == 1, "Wrong last death"
+    assert summary['species'] == {'sh': 1}, "Wrong survivors"
+
+
+def test_feed_region_feeds_only_the_animals_in_the_rectangle():
+    aquarium = Aqua(80, 30)
+    aquarium.add_animal("left", 5, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("right", 5, 50, 10, 0, 0, 'mo')
+    aquarium.add_animal("crab", 5, 12, 30, 1, 0, 'sh')
+    assert aquarium.feed_region(0, 40, 0, 20, 7) == 1, "Only the left fish is there"
+    assert [animal.food for animal in aquarium.get_all_animal()] == [12, 5, 5], "Wrong animal fed"
+    assert aquarium.feed_region(0, 40, 25, 30, 3) == 1, "The crab stands on the floor"
+    for _ in range(20):
+        aquarium.next_turn()
+    left, right, crab = aquarium.get_all_animal()
+    fed = aquarium.feed_region(right.x, right.x + 1, right.y, right.y + 1, 1)
+    assert fed == 1 and right.food == 4, "The index did not follow the fish"
+
+
+def test_queries_follow_the_food_and_the_age(capsys):
+    aquarium = Aqua(80, 30)
+    aquarium.add_animal("old", 99, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("young", 5, 50, 10, 0, 0, 'mo')
+    aquarium.add_animal("crab", 50, 12, 30, 1, 0, 'sh')
+    old, young, crab = aquarium.get_all_animal()
+    assert aquarium.find("young") is young and aquarium.find("nobody") is None, "Wrong animal found"
+    assert aquarium.of_species('sh') == [crab] and aquarium.of_species('oc') == [], "Wrong species"
+    young.add_food(10)
+    for _ in range(30):
+        aquarium.next_turn()
+    assert aquarium.starving(3) == [old, crab], "Wrong starving animals"
+    aquarium.feed_all()
+    assert aquarium.starving(3) == [] and aquarium.starving(13) == [old, crab], "The meal was missed"
+    for _ in range(80):
+        aquarium.next_turn()
+    assert aquarium.older_than(60) == [old] and aquarium.older_than(51) == [old, crab], "Wrong old animals"
+    for _ in range(40):
+        aquarium.next_turn()
+    assert aquarium.find("old") is None and aquarium.older_than(0) == [young], "The dead are still found"
+    capsys.readouterr()
+
+
+def test_advance_matches_next_turn(capsys):
+    specs = [("animal%d" % i, 1 + i * 3, (i * 13) % 90 + 1, 3 + (i * 5) % 22, i % 2, (i // 2) % 2,
+              ['sc', 'sh', 'oc', 'mo', 'oc'][i % 5]) for i in range(14)]
+    stepped, jumped = Aqua(100, 30), Aqua(100, 30)
+    for aquarium in (stepped, jumped):
+        aquarium.add_animals(specs)
+        for animal in aquarium.get_all_animal():
+            animal.food = 20 + animal.id * 7
+    for _ in range(3000):
+        stepped.next_turn()
+    expected = capsys.readouterr().out
+    jumped.advance(3000)
+    assert jumped.snapshot() == stepped.snapshot(), "advance drifted from next_turn"
+    assert jumped.get_board() == stepped.get_board() and jumped.deaths == stepped.deaths, "Wrong board or deaths"
+    assert capsys.readouterr().out == expected, "The death messages are different"
+
+
+def test_advance_jumps_over_a_sparse_tank():
+    aquarium = Aqua(120, 30)
+    aquarium.max_age = 10 ** 5
+    aquarium.add_animal("scalar", 5, 10, 5, 1, 0, 'sc')
+    aquarium.add_animal("shrimp", 5, 10, 30, 1, 0, 'sh')
+    aquarium.add_animal("ocypode", 5, 70, 30, 0, 0, 'oc')
+    for animal in aquarium.get_all_animal():
+        animal.food = 10 ** 6
+    calls = []
+    aquarium.next_turn = lambda: calls.append(Aqua.next_turn(aquarium))
+    aquarium.advance(10 ** 6)
+    assert aquarium.turn == 10 ** 6 and len(aquarium.get_all_animal()) == 3, "Wrong turn"
+    assert len(calls) < 1000, "The turns were not jumped over"
+
+
+def test_advance_steps_only_the_crabs_that_bump(capsys):
+    specs = [("crab%d" % i, 5, 5 + 29 * i + i % 4, 30, i % 2, 0, 'sh' if i % 3 else 'oc') for i in range(12)]
+    specs += [("scalar", 5, 40, 5, 1, 0, 'sc'), ("moly", 5, 200, 12, 0, 1, 'mo')]
+    stepped, jumped = Aqua(400, 30), Aqua(400, 30)
+    for aquarium in (stepped, jumped):
+        aquarium.max_age = 10 ** 5
+        aquarium.add_animals(specs)
+        for animal in aquarium.get_all_animal():
+            animal.food = 10 ** 6
+    for _ in range(6000):
+        stepped.next_turn()
+    calls = []
+    jumped.next_turn = lambda: calls.append(Aqua.next_turn(jumped))
+    jumped.advance(6000)
+    capsys.readouterr()
+    assert jumped.snapshot() == stepped.snapshot(), "advance drifted from next_turn"
+    assert jumped.get_board() == stepped.get_board() and not calls, "Whole turns were run"
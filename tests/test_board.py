@@ -0,0 +1,128 @@
+import pytest
+
+import Board
+from Aqua import Aqua
+
+
+def fill(aquarium):
+    aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("moly", 5, 30, 15, 0, 1, 'mo')
+    aquarium.add_animal("shrimp", 5, 5, 30, 1, 0, 'sh')
+    aquarium.add_animal("ocypode", 5, 30, 30, 0, 0, 'oc')
+
+
+def test_bytearray_board_matches_numpy_board():
+    pytest.importorskip('numpy')
+    dense, rows = Aqua(60, 30), Aqua(60, 30)
+    rows.board = Board.Board(60, 30, use_numpy=False)
+    fill(dense)
+    fill(rows)
+    for _ in range(40):
+        dense.next_turn()
+        rows.next_turn()
+    assert dense.get_board() == rows.get_board(), "The board backends drifted apart"
+
+
+def test_get_board_rows_are_characters():
+    aquarium = Aqua(50, 30)
+    board = aquarium.get_board()
+    assert len(board) == 30 and len(board[0]) == 50, "Wrong board size"
+    assert board[2][1] == '~' and board[5][0] == '|' and board[-1][0] == '\\', "The tank was not drawn"
+
+
+def replay_frames(frames, height):
+    """
+    Plays ANSI frames on a fake screen and returns its rows
+    """
+    screen, row, col = {}, 1, 1
+    for frame in frames:
+        i = 0
+        while i < len(frame):
+            if frame.startswith('\x1b[2J', i):
+                screen, i = {}, i + 4
+            elif frame.startswith('\x1b[', i):
+                end = frame.index('H', i)
+                row, col = (map(int, frame[i + 2:end].split(';')) if end > i + 2 else (1, 1))
+                i = end + 1
+            elif frame[i] == '\n':
+                row, col, i = row + 1, 1, i + 1
+            else:
+                screen[row, col] = frame[i]
+                col, i = col + 1, i + 1
+    width = max(c for r, c in screen)
+    return [''.join(screen.get((r, c), ' ') for c in range(1, width + 1)).rstrip() for r in range(1, height + 1)]
+
+
+def test_incremental_frames_draw_the_board(capsys):
+    aquarium = Aqua(60, 30)
+    fill(aquarium)
+    frames = []
+    for _ in range(15):
+        aquarium.print_board(incremental=True)
+        frames.append(capsys.readouterr().out)
+        aquarium.next_turn()
+    aquarium.print_board(incremental=True)
+    frames.append(capsys.readouterr().out)
+    aquarium.print_board()
+    expected = [line.rstrip() for line in capsys.readouterr().out.splitlines()]
+    assert replay_frames(frames, 30) == expected, "The frames do not add up to the board"
+    assert max(len(frame) for frame in frames[1:]) < len(frames[0]) / 3, "The frames are not incremental"
+
+
+def test_refresh_marks_only_the_animals_that_moved(capsys):
+    aquarium = Aqua(200, 60)
+    fill(aquarium)
+    aquarium.print_board(incremental=True)
+    aquarium.next_turn()
+    aquarium.refresh_board()
+    spans = aquarium.renderer.spans()
+    assert spans and len(spans) < 20, "Rows without animals were marked"
+    assert all(x1 - x0 <= 40 for x0, x1 in spans.values()), "Columns without animals were marked"
+    aquarium.print_board(incremental=True)
+    assert aquarium.renderer.front == [aquarium.board.row_string(y) for y in range(60)], "A change was not marked"
+
+
+def test_sparse_tank_matches_dense_tank():
+    dense, sparse = Aqua(70, 30), Aqua(70, 30, sparse=True)
+    fill(dense)
+    fill(sparse)
+    for _ in range(40):
+        dense.next_turn()
+        sparse.next_turn()
+        assert dense.get_board() == sparse.get_board(), "The sparse board drifted"
+    assert dense.get_board(20, 25, 10, 10) == sparse.get_board(20, 25, 10, 10), "Wrong window"
+    assert len(sparse.board.tiles) < 8, "The empty tiles were kept"
+
+
+def test_huge_sparse_tank_keeps_only_the_tiles_in_use():
+    aquarium = Aqua(100000, 10000, sparse=True)
+    assert aquarium.add_animal("scalar", 5, 50000, 5000, 1, 0, 'sc'), "No room for the scalar"
+    aquarium.add_animal("ocypode", 5, 99000, 10000, 0, 0, 'oc')
+    aquarium.next_turn()
+    window = aquarium.get_board(49995, 4998, 20, 10)
+    assert len(window) == 10 and '*' in ''.join(''.join(row) for row in window), "The scalar is not in the window"
+    assert aquarium.get_board(99990, 9990, 20, 20)[-1][-1] == '/', "The window was not clipped to the tank"
+    assert len(aquarium.board.tiles) <= 8, "The board was not kept sparse"
+
+
+def test_viewport_matches_the_board_window():
+    aquarium = Aqua(70, 30)
+    fill(aquarium)
+    for turn in range(30):
+        aquarium.next_turn()
+        x0, y0 = turn * 3 - 10, turn % 25 - 3
+        board = aquarium.get_board()
+        expected = [''.join(row[max(x0, 0):max(x0 + 25, 0)]) for row in board[max(y0, 0):max(y0 + 12, 0)]]
+        assert aquarium.render_viewport(x0, y0, 25, 12) == expected, "Wrong viewport on turn %d" % turn
+        assert aquarium.get_board(x0, y0, 25, 12) == [list(row) for row in expected], "Wrong window"
+
+
+def test_viewport_follows_an_animal_without_drawing_the_board():
+    aquarium = Aqua(100000, 10000, sparse=True)
+    aquarium.add_animal("scalar", 5, 50000, 5000, 1, 0, 'sc')
+    aquarium.next_turn()
+    window = aquarium.render_viewport(width=40, height=20, follow="scalar")
+    assert len(window) == 20 and window[10] == " " * 18 + "******" + " " * 16, "The scalar is not in the middle"
+    assert aquarium.board_stale, "The board was drawn"
+    with pytest.raises(ValueError):
+        aquarium.render_viewport(follow="nobody")
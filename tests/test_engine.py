@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from Aqua import Aqua
+
+
+def build(seed, width=80, height=30, count=25):
+    random.seed(seed)
+    aquarium = Aqua(width, height)
+    for i in range(count):
+        aquarium.add_animal("animal%d" % i, random.randint(1, 119), random.randint(1, width - 1),
+                            random.randint(3, height - 1), random.randint(0, 1), random.randint(0, 1),
+                            random.choice(['sc', 'mo', 'sh', 'oc', 'sh', 'oc']))
+    return aquarium
+
+
+def state(aquarium):
+    animals = [(a.name, a.get_position(), a.get_directionH(), a.get_food(), a.get_age())
+               for a in aquarium.get_all_animal()]
+    return aquarium.turn, animals, aquarium.get_board(), aquarium.deaths, aquarium.last_death
+
+
+def test_batch_turns_match_next_turn(capsys):
+    pytest.importorskip('numpy')
+    for seed in range(5):
+        one_by_one, batch = build(seed), build(seed)
+        capsys.readouterr()
+        for i in range(260):
+            if i % 50 == 0:
+                one_by_one.feed_all()
+            one_by_one.next_turn()
+        expected = capsys.readouterr().out
+        batch.batch_turns(260, feed_every=50)
+        assert state(batch) == state(one_by_one), "The engine drifted from next_turn"
+        assert capsys.readouterr().out == expected, "The death messages are different"
@@ -0,0 +1,49 @@
+import io
+
+import Events
+from Aqua import Aqua
+
+
+def build():
+    aquarium = Aqua(80, 30)
+    aquarium.max_age = 30
+    aquarium.add_animals([("animal%d" % i, 5 + i, (i * 9) % 70 + 1, 3 + (i * 5) % 22, i % 2, (i // 2) % 2,
+                           ['sc', 'mo', 'sh', 'oc', 'sh', 'oc'][i % 6]) for i in range(30)])
+    return aquarium
+
+
+def test_events_follow_every_animal():
+    aquarium, quiet = build(), build()
+    batches = []
+    aquarium.subscribe(lambda turn, events: batches.append((turn, events)))
+    aquarium.feed_all()
+    aquarium.run(120, feed_every=50)
+    quiet.feed_all()
+    quiet.run(120, feed_every=50)
+    assert aquarium.snapshot() == quiet.snapshot(), "Listening changed the simulation"
+    assert [turn for turn, events in batches] == list(range(120)), "One batch per turn"
+
+    positions = {}
+    kinds = set()
+    for turn, events in batches:
+        for event in events:
+            kinds.add(event.kind)
+            if event.kind == 'died':
+                del positions[event.id]
+            else:
+                positions[event.id] = (event.x, event.y, event.directionH, event.directionV)
+    expected = {animal.id: (animal.x, animal.y, animal.directionH, getattr(animal, 'directionV', 0))
+                for animal in aquarium.get_all_animal()}
+    assert positions == expected, "The events do not tell where the animals are"
+    assert {'moved', 'bounced', 'collided', 'fed', 'aged', 'died'} <= kinds, "An event kind is missing"
+
+
+def test_stream_and_event_log():
+    aquarium = build()
+    log = io.StringIO()
+    aquarium.subscribe(Events.EventLog(log))
+    streamed = list(aquarium.stream(30))
+    assert [turn for turn, events in streamed] == list(range(30)), "One batch per turn"
+    assert len(aquarium.listeners) == 1, "The stream did not unsubscribe"
+    log.seek(0)
+    assert list(Events.read(log)) == [(turn, events) for turn, events in streamed if events], "The log is different"
@@ -0,0 +1,59 @@
+import pickle
+
+import Lifecycle
+import Scalar
+
+
+def make(name, age, food):
+    animal = Scalar.Scalar(name, age, 10, 10, 1, 0)
+    animal.id, animal.food = int(name[1:]), food
+    return animal
+
+
+def test_ticks_match_dec_food_and_inc_age(capsys):
+    scheduled = [make("s%d" % i, 100 + i % 25, 1 + i % 13) for i in range(40)]
+    plain = [pickle.loads(pickle.dumps(animal)) for animal in scheduled]
+    scheduler = Lifecycle.Lifecycle()
+    for animal in scheduled:
+        scheduler.add(animal)
+    for turn in range(0, 400, 10):
+        if turn % 70 == 0:
+            scheduler.feed(3)
+            for animal in plain:
+                animal.add_food(3)
+        dying = scheduler.tick(turn % 100 == 0, 120)
+        expected = {}
+        for animal in plain:
+            if animal.alive:
+                animal.dec_food()
+                if not animal.alive:
+                    expected[animal.id] = 'starvation'
+                elif turn % 100 == 0:
+                    animal.inc_age(120)
+                    if not animal.alive:
+                        expected[animal.id] = 'age'
+        assert dying == expected, "Wrong deaths on turn %d" % turn
+        alive = [(a.id, a.food, a.age) for a in plain if a.alive]
+        assert alive == [(a.id, a.food, a.age) for a in scheduled if a.id in scheduler.animals], "Drifted"
+    capsys.readouterr()
+
+
+def test_a_meal_brings_back_an_animal_under_zero_food():
+    scheduler = Lifecycle.Lifecycle()
+    animal = make("s1", 5, 0)
+    scheduler.add(animal)
+    assert scheduler.tick() == {} and animal.food == -1, "Food under 0 never starves"
+    scheduler.feed(2)
+    assert scheduler.tick() == {1: 'starvation'}, "It starves again after a meal"
+    assert animal.scheduler is None and animal.food == 0, "A dead animal keeps its food"
+
+
+def test_animals_leave_the_clocks_when_pickled():
+    scheduler = Lifecycle.Lifecycle()
+    animal = make("s1", 5, 10)
+    scheduler.add(animal)
+    scheduler.tick(True)
+    copy = pickle.loads(pickle.dumps(animal))
+    assert (copy.food, copy.age, copy.scheduler) == (9, 6, None), "Wrong copy"
+    scheduler.tick()
+    assert (animal.food, copy.food) == (8, 9), "The copy still follows the clocks"
@@ -0,0 +1,45 @@
+import pytest
+
+import Replay
+from Aqua import Aqua
+
+
+def test_replay_seeks_to_any_recorded_turn(tmp_path):
+    aquarium = Aqua(100, 30)
+    aquarium.max_age = 30
+    aquarium.add_animals([("animal%d" % i, 5 + i, (i * 9) % 90 + 1, 3 + (i * 5) % 22, i % 2, (i // 2) % 2,
+                           ['sc', 'mo', 'sh', 'oc', 'sh', 'oc'][i % 6]) for i in range(30)])
+    expected = {}
+    with Replay.Recorder(aquarium, str(tmp_path), keyframe_every=100) as recorder:
+        for i in range(350):
+            expected[aquarium.turn] = (aquarium.snapshot(), aquarium.get_board(), aquarium.summary())
+            if i == 120:
+                aquarium.add_animal("late", 1, 40, 10, 1, 0, 'mo')
+            if i % 40 == 0:
+                aquarium.feed_all()
+            recorder.run(1)
+        expected[aquarium.turn] = (aquarium.snapshot(), aquarium.get_board(), aquarium.summary())
+
+    replay = Replay.Replay(str(tmp_path))
+    assert replay.keyframes == [0, 100, 200, 300], "Wrong keyframes"
+    for turn in (0, 1, 99, 100, 121, 122, 250, 349, 350):
+        tank = replay.seek(turn)
+        assert tank.turn == turn, "Wrong turn"
+        assert (tank.snapshot(), tank.get_board(), tank.summary()) == expected[turn], "The replay drifted"
+    assert [turn for turn, events in replay.turns(340)] == list(range(340, 350)), "Wrong turns"
+    with pytest.raises(ValueError):
+        replay.seek(351)
+
+
+def test_a_recording_is_never_mixed_with_another(tmp_path):
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+    with Replay.Recorder(aquarium, str(tmp_path), keyframe_every=10) as recorder:
+        recorder.run(25)
+    with pytest.raises(FileExistsError):
+        Replay.Recorder(aquarium, str(tmp_path))
+    assert Replay.Replay(str(tmp_path)).keyframes == [0, 10, 20], "The recording was changed"
+    with open(tmp_path / Replay.INDEX, 'a', encoding='utf-8') as index:
+        index.write('0 0\n')
+    with pytest.raises(ValueError):
+        Replay.Replay(str(tmp_path))
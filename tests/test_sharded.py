@@ -0,0 +1,27 @@
+import random
+
+from Aqua import Aqua
+from Sharded import ShardedAqua
+
+
+def build(seed):
+    random.seed(seed)
+    aquarium = Aqua(240, 40)
+    aquarium.add_animals([("animal%d" % i, random.randint(1, 100), random.randint(1, 239), random.randint(3, 39),
+                           random.randint(0, 1), random.randint(0, 1), random.choice(['sc', 'mo', 'sh', 'oc']))
+                          for i in range(150)])
+    return aquarium
+
+
+def test_sharded_run_matches_a_single_process():
+    single, sharded = build(7), build(7)
+    animals = list(sharded.get_all_animal())
+    single.run(300, feed_every=50)
+    with ShardedAqua(sharded, workers=3) as shards:
+        shards.run(150, feed_every=50, sync_every=20)
+        shards.run(150, feed_every=50, sync_every=35)
+    assert sharded.turn == single.turn == 300, "Wrong turn"
+    assert sharded.snapshot() == single.snapshot(), "The animals ended up differently"
+    assert sharded.get_board() == single.get_board(), "The composed board is different"
+    assert sharded.summary() == single.summary(), "The deaths were not counted the same"
+    assert all(animal in animals for animal in sharded.get_all_animal()), "The animals were replaced by copies"
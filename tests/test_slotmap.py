@@ -0,0 +1,36 @@
+import pickle
+
+import Scalar
+import SlotMap
+from Aqua import Aqua
+
+
+def make(animal_id):
+    animal = Scalar.Scalar("s%d" % animal_id, 5, 10, 10, 1, 0)
+    animal.id = animal_id
+    return animal
+
+
+def test_removing_keeps_the_order_of_the_others():
+    animals = [make(i) for i in range(1, 11)]
+    herd = SlotMap.SlotMap(animals)
+    herd.remove(animals[2])
+    assert herd.discard(7) is animals[6] and herd.discard(7) is None, "Wrong animal taken out"
+    herd.append(make(11))
+    assert [animal.id for animal in herd] == [1, 2, 4, 5, 6, 8, 9, 10, 11], "The order changed"
+    assert len(herd) == 9 and herd.get(8) is animals[7] and herd.index(animals[7]) == 5, "Wrong slots"
+    assert animals[2] not in herd and herd[-1].id == 11, "Wrong lookups"
+    herd[:] = [animal for animal in herd if animal.id % 2]
+    assert [animal.id for animal in pickle.loads(pickle.dumps(herd))] == [1, 5, 9, 11], "Wrong copy"
+
+
+def test_a_whole_cohort_dies_on_the_same_turn(capsys):
+    aquarium = Aqua(400, 40)
+    for i in range(40):
+        aquarium.add_animal("old%d" % i if i % 2 else "young%d" % i, 119 if i % 2 else 5, 2 + i * 9, 10, 1, 0, 'sc')
+    aquarium.next_turn()
+    survivors = aquarium.get_all_animal()
+    assert aquarium.deaths['age'] == 20 and len(survivors) == 20, "The cohort did not die"
+    assert [animal.name for animal in survivors] == ["young%d" % i for i in range(0, 40, 2)], "The order changed"
+    assert survivors.get(2) is None and survivors.get(3).name == "young2", "Wrong lookups by id"
+    capsys.readouterr()
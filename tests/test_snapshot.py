@@ -0,0 +1,48 @@
+import pytest
+
+from Aqua import Aqua
+
+
+def build():
+    aquarium = Aqua(80, 30)
+    aquarium.add_animals([("animal%d" % i, 5 + i, (i * 9) % 70 + 1, 3 + (i * 5) % 22, i % 2, (i // 2) % 2,
+                           ['sc', 'mo', 'sh', 'oc'][i % 4]) for i in range(24)])
+    return aquarium
+
+
+def test_save_and_load_restore_the_tank(tmp_path):
+    aquarium, expected = build(), build()
+    aquarium.run(95, feed_every=30)
+    expected.run(95, feed_every=30)
+    expected.run(150, feed_every=30)
+    for board in (True, False):
+        path = str(tmp_path / ("tank%d.snap" % board))
+        aquarium.save(path, board=board)
+        copy = Aqua.load(path)
+        assert copy.snapshot() == aquarium.snapshot(), "The animals were not restored"
+        assert copy.summary() == aquarium.summary() and copy.next_id == aquarium.next_id, "The counters were lost"
+        assert copy.get_board() == aquarium.get_board(), "The board was not restored"
+        copy.run(150, feed_every=30)
+        assert copy.snapshot() == expected.snapshot(), "The restored tank does not run the same"
+
+
+def test_run_saves_checkpoints(tmp_path):
+    path = tmp_path / "checkpoint.snap"  # a pathlib path works too.
+    aquarium = build()
+    aquarium.run(70, checkpoint_every=30, checkpoint_path=path)
+    assert Aqua.load(path).turn == 60, "The last checkpoint is at turn 60"
+    with pytest.raises(ValueError):
+        aquarium.run(70, checkpoint_every=30)
+    assert aquarium.turn == 70, "The run started without a checkpoint path"
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "other.snap"
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(ValueError):
+        Aqua.load(str(path))
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("a very long name for a little scalar", 5, 10, 10, 1, 0, 'sc')
+    with pytest.raises(ValueError):
+        aquarium.save(str(tmp_path / "long.snap"))
+    assert not list(tmp_path.glob("long.snap*")), "A failed save left a file behind"
@@ -0,0 +1,19 @@
+import Sweep
+
+
+def config(feed_amount):
+    animals = [("animal%d" % i, 100, (i * 9) % 70 + 1, 3 + (i * 5) % 22, i % 2, 0, ['sc', 'mo', 'sh', 'oc'][i % 4])
+               for i in range(20)]
+    return {'name': 'feed %d' % feed_amount, 'width': 80, 'height': 30, 'feed_amount': feed_amount,
+            'max_age': 110, 'animals': animals}
+
+
+def test_run_many_matches_running_the_tanks_one_by_one():
+    configs = [config(feed_amount) for feed_amount in (1, 5)]
+    configs.append(Sweep.build(config(10)))
+    summaries = sorted(Sweep.run_many(configs, 1200, feed_every=50, workers=2), key=lambda summary: summary['tank'])
+    assert [summary['tank'] for summary in summaries] == [0, 1, 2], "A tank is missing"
+    for index, summary in enumerate(summaries):
+        assert summary == Sweep.run_tank(index, configs[index], 1200, 50), "A tank ran differently"
+    assert summaries[0]['name'] == 'feed 1' and summaries[0]['deaths']['starvation'] > 0, "The hungry tank starved"
+    assert summaries[1]['deaths']['age'] > 0 and summaries[1]['last_death'] == 900, "The fed tank grew old"
@@ -0,0 +1,36 @@
+import io
+
+import Viewer
+from Aqua import Aqua
+
+
+def make(**options):
+    aquarium = Aqua(60, 30)
+    aquarium.add_animal("scalar", 5, 10, 10, 1, 0, 'sc')
+    aquarium.add_animal("shrimp", 5, 10, 30, 1, 0, 'sh')
+    return Viewer.Viewer(aquarium, stream=io.StringIO(), input_stream=io.StringIO(), **options)
+
+
+def test_frames_are_dropped_not_turns():
+    viewer = make(tick=0.001, fps=20, max_turns=150)
+    viewer.start()
+    assert viewer.aqua.turn == 150, "The turns must not wait for the frames"
+    assert viewer.frames < 40 and viewer.dropped > 0, "The frames were not capped"
+    assert viewer.stream.getvalue().startswith(Viewer.Renderer.CLEAR_SCREEN), "The first frame is a full one"
+
+
+def test_commands():
+    viewer = make()
+    assert viewer.command("add mo nemo 3 40 12 0 1") == "added nemo", "The moly was not added"
+    assert viewer.command("add sh crabby 3 30") == "added crabby", "The crab goes on the floor"
+    assert viewer.command("add xx who 3 30").startswith("bad arguments"), "Unknown type"
+    for bad in ("add sc neg 3 5 -4 1 1", "add sc far 3 60 10", "add mo zero 0 20 10", "add sh back 3 30 0 2"):
+        assert viewer.command(bad).startswith("bad arguments"), "Out of range: " + bad
+    assert len(viewer.aqua.get_all_animal()) == 4, "A rejected animal was added"
+    assert viewer.command("step 12") == "turn 12", "Wrong turn"
+    assert viewer.command("pause") == "paused" and viewer.paused, "Not paused"
+    assert viewer.command("print") == "4 animals", "Wrong count"
+    assert viewer.messages[-1].startswith("The crab crabby"), "The animals are shown under the board"
+    assert viewer.command("dance") == Viewer.HELP, "Unknown commands show the help"
+    viewer.command("quit")
+    assert viewer.done.is_set(), "Did not quit"